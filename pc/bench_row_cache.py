@@ -0,0 +1,89 @@
+"""
+행 OCR 캐시 벤치마크: 기록된 캡처(replay.py)를 시간순으로 재생
+
+사용법:
+  1. config.json 에 "record_dir": "C:\\posdelay_rec" 지정 → 저녁 영업 동안 모니터 실행
+     (행 캐시는 주문 목록 영역 필요: python pos_scan.py layout → layout_cache.json rois.list)
+  2. python bench_row_cache.py C:\\posdelay_rec
+     → 전체 OCR vs 행 캐시: 프레임당 시간, 정확도, 캐시 적중/미스/축출
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from PIL import Image
+
+from layout_cache import list_roi as layout_list_roi
+from monitor_config import DEFAULT_CONFIG, load_config
+from ocr_pipeline import check_tesseract, ocr_order_count, ocr_params
+from replay import load_frames
+from row_cache import RowOcrCache
+
+
+def _run(frames, row_cache, params, list_roi):
+    """프레임 재생 → (ms 목록, 정답 수, 정답(label) 있는 프레임 수, OCR 행 수, 전체 행 수)"""
+    times = []
+    correct = labelled = rows_ocr = rows = 0
+    for path, label, explicit in frames:
+        img = Image.open(path).convert("RGB")
+        timings = {}
+        t = time.perf_counter()
+        count, _ = ocr_order_count(img, row_cache, timings, list_roi=list_roi, **params)
+        times.append((time.perf_counter() - t) * 1000)
+        rows_ocr += timings.get("rows_ocr", 0)
+        rows += timings.get("rows", 0)
+        if explicit:
+            labelled += 1
+            correct += int(count == label)
+    return times, correct, labelled, rows_ocr, rows
+
+
+def _summary(name, times, correct, labelled):
+    p95 = sorted(times)[int(len(times) * 0.95) - 1] if len(times) >= 20 else max(times)
+    acc = f"{correct}/{labelled} ({correct / labelled:.1%})" if labelled else "-"
+    return (f"  {name:<8} 평균 {statistics.mean(times):7.1f} ms  중앙 {statistics.median(times):7.1f} ms  "
+            f"p95 {p95:7.1f} ms  정확도 {acc}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="행 OCR 캐시 벤치마크")
+    ap.add_argument("record_dir")
+    ap.add_argument("--max-entries", type=int, default=DEFAULT_CONFIG["row_cache_max_entries"])
+    ap.add_argument("--max-mb", type=float, default=DEFAULT_CONFIG["row_cache_max_mb"])
+    ap.add_argument("--no-full", action="store_true", help="전체 OCR 기준 측정 생략")
+    args = ap.parse_args()
+    # 프레임마다 찍히는 행 분류 / OCR 텍스트 로그가 결과 표를 덮지 않도록 경고만
+    logging.getLogger("mate_monitor.ocr").setLevel(logging.WARNING)
+
+    frames = load_frames(args.record_dir)
+    if not frames:
+        print(f"[!] 기록된 프레임 없음: {args.record_dir}")
+        return
+    list_roi = layout_list_roi()
+    if not list_roi:
+        print("[!] 주문 목록 영역 없음 → python pos_scan.py layout 먼저 실행 (행 캐시는 목록 영역 안에서만 동작)")
+        return
+    cfg, _ = load_config()
+    check_tesseract(cfg)
+    params = ocr_params(cfg)
+    print(f"프레임 {len(frames)}개 재생 (목록 영역 {list_roi}, 정답 label {sum(f[2] for f in frames)}개)")
+
+    cache = RowOcrCache(max_entries=args.max_entries, max_bytes=int(args.max_mb * 1024 * 1024))
+    c_times, c_ok, labelled, rows_ocr, rows = _run(frames, cache, params, list_roi)
+
+    print("=== 결과 ===")
+    if not args.no_full:
+        f_times, f_ok, _, _, _ = _run(frames, None, params, list_roi)
+        print(_summary("전체OCR", f_times, f_ok, labelled))
+    print(_summary("행캐시", c_times, c_ok, labelled))
+    if not args.no_full:
+        print(f"  속도 향상: x{statistics.mean(f_times) / statistics.mean(c_times):.2f}")
+    print(f"  OCR 한 행: {rows_ocr}/{rows}")
+    for k, v in cache.stats().items():
+        print(f"  {k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
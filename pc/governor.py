@@ -0,0 +1,182 @@
+"""
+OCR 자원 거버너: 모니터가 POS 와 같은 PC 에서 CPU 를 빼앗지 않도록
+
+- 시작 시 프로세스 우선순위 낮춤 (Windows BELOW_NORMAL / 그 외 nice)
+  → Tesseract 자식 프로세스도 상속
+- OMP_THREAD_LIMIT 로 Tesseract 스레드 수 제한 (코어 하나만 사용)
+- 폴링마다 자기 CPU 점유율 측정 (Tesseract 자식 프로세스 포함)
+  Windows: Job 객체 누적 CPU 시간 / 그 외: os.times() 자식 포함
+- 예산 초과 시 한 단계씩 저비용 모드로, 여유가 계속되면 한 단계씩 복귀
+
+단계 (누적):
+  full       config 설정 그대로 (확대 + 반전 재시도)
+  no_invert  반전 재시도 생략
+  roi        주문 목록 영역만 OCR (pos_scan.py layout 으로 rois 저장 시)
+  low_scale  전체 OCR 확대 배율 낮춤 (행 경로는 config 배율 유지 → 템플릿 / 행 캐시 키 그대로)
+"""
+
+import ctypes
+import os
+import sys
+import time
+
+LEVELS = ["full", "no_invert", "roi", "low_scale"]
+# 점유율 이동평균 가중치 (최근 폴링 비중)
+EWMA_ALPHA = 0.3
+# 예산의 이 비율 아래로 연속 RECOVER_POLLS 회 → 한 단계 복귀
+RECOVER_RATIO = 0.5
+RECOVER_POLLS = 5
+
+_BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+_JobObjectBasicAccountingInformation = 1
+
+
+class _JobAccounting(ctypes.Structure):
+    _fields_ = [
+        ("TotalUserTime", ctypes.c_int64),
+        ("TotalKernelTime", ctypes.c_int64),
+        ("ThisPeriodTotalUserTime", ctypes.c_int64),
+        ("ThisPeriodTotalKernelTime", ctypes.c_int64),
+        ("TotalPageFaultCount", ctypes.c_uint32),
+        ("TotalProcesses", ctypes.c_uint32),
+        ("ActiveProcesses", ctypes.c_uint32),
+        ("TotalTerminatedProcesses", ctypes.c_uint32),
+    ]
+
+
+def set_ocr_threads(ocr_threads):
+    """이후 실행되는 Tesseract 스레드 수 제한 (0: 제한 없음)"""
+    if ocr_threads:
+        os.environ["OMP_THREAD_LIMIT"] = str(ocr_threads)
+    else:
+        os.environ.pop("OMP_THREAD_LIMIT", None)
+
+
+def lower_priority(ocr_threads=1):
+    """우선순위 낮춤 + Tesseract 스레드 제한 (pytesseract 첫 호출 전에)"""
+    set_ocr_threads(ocr_threads)
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetPriorityClass(kernel32.GetCurrentProcess(),
+                                                  _BELOW_NORMAL_PRIORITY_CLASS))
+        os.nice(5)
+        return True
+    except Exception:
+        return False
+
+
+class CpuClock:
+    """이 프로세스 + 자식(Tesseract) 누적 CPU 초"""
+
+    def __init__(self):
+        self._job = None
+        if sys.platform == "win32":
+            try:
+                kernel32 = ctypes.windll.kernel32
+                job = kernel32.CreateJobObjectW(None, None)
+                if job and kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess()):
+                    self._job = job
+            except Exception:
+                self._job = None
+
+    @property
+    def includes_children(self):
+        return self._job is not None or sys.platform != "win32"
+
+    def seconds(self):
+        if self._job is not None:
+            info = _JobAccounting()
+            if ctypes.windll.kernel32.QueryInformationJobObject(
+                    self._job, _JobObjectBasicAccountingInformation,
+                    ctypes.byref(info), ctypes.sizeof(info), None):
+                return (info.TotalUserTime + info.TotalKernelTime) / 1e7  # 100ns 단위
+        t = os.times()
+        return t.user + t.system + t.children_user + t.children_system
+
+
+class ResourceGovernor:
+    """폴링별 CPU 점유율 → OCR 단계 결정
+
+    budget_pct: PC 전체 CPU 대비 허용 점유율 (%). 코어 수로 나눈 값 기준. 0 이면 측정만
+    roi: 주문 목록 영역 [x, y, w, h] (창 기준). 없으면 roi 단계 건너뜀
+    """
+
+    def __init__(self, budget_pct=10, scale=2, low_scale=1.5, roi=None, clock=None):
+        self.configure(budget_pct, scale, low_scale)
+        self.roi = roi
+        self.clock = clock or CpuClock()
+        self.cores = os.cpu_count() or 1
+        self.level = 0
+        self.share = None  # 이동평균 점유율 (0~1)
+        self.last_cpu_ms = 0
+        self.changes = 0
+        self.last_change = None
+        self._calm = 0
+        self._t = time.monotonic()
+        self._cpu = self.clock.seconds()
+
+    def configure(self, budget_pct, scale, low_scale):
+        """설정 변경 반영 (실행 중 config.json 수정 시). 단계는 유지"""
+        self.budget = budget_pct / 100
+        self.scale = scale
+        self.low_scale = low_scale
+
+    def mode(self):
+        """현재 단계 → ocr 옵션 {"scale", "invert", "roi"} (scale 은 전체 OCR 배율, ocr_params → full_scale)"""
+        name = LEVELS[self.level]
+        return {
+            "scale": min(self.low_scale, self.scale) if name == "low_scale" else self.scale,
+            "invert": name == "full",
+            "roi": self.roi if self.level >= LEVELS.index("roi") else None,
+        }
+
+    def _allowed(self, level):
+        return LEVELS[level] != "roi" or self.roi is not None
+
+    def update(self):
+        """폴링 1회 끝날 때 호출 → 단계 변경 시 설명 문자열, 아니면 None"""
+        now, cpu = time.monotonic(), self.clock.seconds()
+        wall, used = now - self._t, cpu - self._cpu
+        self._t, self._cpu = now, cpu
+        if wall <= 0:
+            return None
+        self.last_cpu_ms = round(used * 1000)
+        share = used / (wall * self.cores)
+        self.share = share if self.share is None else EWMA_ALPHA * share + (1 - EWMA_ALPHA) * self.share
+
+        if not self.budget:
+            return self._set(0, "꺼짐") if self.level else None
+        if self.share > self.budget:
+            self._calm = 0
+            nxt = next((lv for lv in range(self.level + 1, len(LEVELS)) if self._allowed(lv)), None)
+            if nxt is not None:
+                return self._set(nxt, "예산 초과")
+        elif self.share < self.budget * RECOVER_RATIO:
+            self._calm += 1
+            if self._calm >= RECOVER_POLLS and self.level > 0:
+                self._calm = 0
+                prev = next(lv for lv in range(self.level - 1, -1, -1) if self._allowed(lv))
+                return self._set(prev, "여유")
+        else:
+            self._calm = 0
+        return None
+
+    def _set(self, level, reason):
+        old = LEVELS[self.level]
+        self.level = level
+        self.changes += 1
+        self.last_change = {"time": time.strftime("%H:%M:%S"), "from": old, "to": LEVELS[level],
+                            "reason": reason, "cpu_pct": round(self.share * 100, 1)}
+        return f"OCR 모드 {old} → {LEVELS[level]} ({reason}, CPU {self.share * 100:.1f}% / 예산 {self.budget * 100:g}%)"
+
+    def stats(self):
+        return {
+            "level": LEVELS[self.level],
+            "cpu_pct": round(self.share * 100, 1) if self.share is not None else None,
+            "budget_pct": round(self.budget * 100, 1),
+            "last_cpu_ms": self.last_cpu_ms,
+            "children_counted": self.clock.includes_children,
+            "changes": self.changes,
+            "last_change": self.last_change,
+        }
@@ -0,0 +1,34 @@
+"""
+layout_cache.json: 지난 실행에서 연결된 창 정보 (backend, handle) + 요소 위치 (rois, pos_scan.py layout)
+
+모니터 / pos_scan.py / tune_ocr.py / bench_row_cache.py 공용 (mate_monitor 를 import 하지 않고 읽기)
+"""
+
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LAYOUT_FILE = os.path.join(SCRIPT_DIR, "layout_cache.json")
+
+
+def load_layout():
+    """지난 실행에서 연결된 창 정보 (backend, handle) + 요소 위치 (rois, pos_scan.py layout) 캐시"""
+    try:
+        with open(LAYOUT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_layout(layout):
+    try:
+        with open(LAYOUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(layout, f, indent=2, ensure_ascii=False)
+    except Exception:
+        pass
+
+
+def list_roi(layout=None):
+    """주문 목록 영역 [x, y, w, h] (창 기준, 없으면 None)"""
+    layout = load_layout() if layout is None else layout
+    return layout.get("rois", {}).get("list")
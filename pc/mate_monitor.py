@@ -5,46 +5,61 @@ PosDelay 폰 앱에서 읽어서 광고 자동 제어에 활용
 사용법:
   1. Python 설치 (python.org → Add to PATH 체크)
   2. cmd에서: pip install pywinauto requests pillow pytesseract
+     (선택) pip install numpy → 템플릿 인식기 사용 (status_matcher.py)
   3. Tesseract OCR 설치: https://github.com/UB-Mannheim/tesseract/wiki
      → 설치 시 "Additional language data" 에서 Korean 체크
   4. 이 파일 실행: python mate_monitor.py
 
 처음 실행 시 설정 자동 안내됩니다.
+무인 PC: config.json 대신 환경변수 POSDELAY_<설정키> (예: POSDELAY_GITHUB_TOKEN) + --headless
+  → 입력 대기 없이 시작. 실행 중 config.json 을 고치면 재시작 없이 반영
+시작 단계별 소요시간 확인: python mate_monitor.py --profile-startup
+실행 중인 모니터 상태 조회: python mate_monitor.py --status
+  (이미 실행 중이면 두 번째 실행은 기존 모니터를 종료하지 않고 상태만 출력)
+주문 이벤트 조회 (seq 이후 변경분): python mate_monitor.py --events 120
+OCR 배율 / 이진화 자동 조정 (기록된 캡처 필요): python tune_ocr.py <record_dir>
 """
 
 import ctypes
 import ctypes.wintypes
 import json
+import logging
 import os
 import re
 import subprocess
 import sys
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from governor import ResourceGovernor, lower_priority, set_ocr_threads
+from layout_cache import LAYOUT_FILE, load_layout, save_layout
+from monitor_config import (
+    CONFIG_FILE, DEFAULT_CONFIG, ConfigWatcher, changed_keys, is_headless, load_config as read_config, save_config,
+)
+from ocr_pipeline import (
+    check_tesseract, get_matcher, get_row_cache, model_path, ocr_order_count, ocr_params, pipeline_stats,
+    reset_matcher, set_tesseract_path,
+)
+from order_events import OrderTracker, format_event
+from order_stats import OrderStats
+from single_instance import SingleInstance, StatusServer, format_status, query, query_status
+from startup_profile import StartupProfile
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
 LOCK_FILE = os.path.join(SCRIPT_DIR, "monitor.lock")
-
-DEFAULT_CONFIG = {
-    "github_token": "",
-    "gist_id": "a67e5de3271d6d0716b276dc6a8391cb",
-    "window_title": "메인",
-    "delivery_tab_id": "198354",
-    "processing_tab_id": "133094",
-    "poll_interval_sec": 30,
-    "tesseract_path": r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-}
+ORDER_STATE_FILE = os.path.join(SCRIPT_DIR, "order_state.json")
 
 
 def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-            for k, v in DEFAULT_CONFIG.items():
-                if k not in cfg:
-                    cfg[k] = v
-            return cfg
+    """검증된 설정 (config.json + POSDELAY_* 환경변수, monitor_config.py)
+
+    토큰이 없고 콘솔에서 직접 실행한 경우에만 첫 실행 안내 (--headless / 무인 PC 는 입력 대기 없음)
+    """
+    cfg, warnings = read_config()
+    for w in warnings:
+        print(f"[!] {w}")
+    if cfg["github_token"] or is_headless():
+        return cfg
     print("\n=== 첫 실행: 설정 파일 생성 ===\n")
     print("GitHub Personal Access Token이 필요합니다.")
     print("  1. https://github.com/settings/tokens/new 접속")
@@ -53,18 +68,14 @@ def load_config():
     print("  4. 체크: gist")
     print("  5. Generate token 클릭 → 토큰 복사\n")
     token = input("토큰 붙여넣기: ").strip()
-    cfg = DEFAULT_CONFIG.copy()
-    cfg["github_token"] = token
-    save_config(cfg)
-    print(f"\n[OK] config.json 생성 완료: {CONFIG_FILE}")
+    if token:
+        cfg["github_token"] = token
+        # 새 파일이면 기본값 전체를 써서 편집하기 쉽게
+        save_config({"github_token": token} if os.path.exists(CONFIG_FILE) else {**DEFAULT_CONFIG, "github_token": token})
+        print(f"\n[OK] config.json 저장: {CONFIG_FILE}")
     return cfg
 
 
-def save_config(cfg):
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2, ensure_ascii=False)
-
-
 def dismiss_popup():
     """MATE POS 팝업 자동 닫기"""
     from pywinauto import Application
@@ -90,11 +101,34 @@ def dismiss_popup():
         pass
 
 
-def connect_pos(cfg):
-    """POS 메인 창에 연결"""
+def _connect_cached(keyword, layout):
+    """캐시된 핸들로 바로 연결 (descendants 탐색 생략). 실패 시 None"""
+    from pywinauto import Application
+    handle = layout.get("handle")
+    backend = layout.get("backend")
+    if not handle or backend not in ("uia", "win32"):
+        return None, None
+    try:
+        app = Application(backend=backend).connect(handle=handle, timeout=1)
+        win = app.window(handle=handle)
+        if keyword not in win.window_text():
+            return None, None
+        return app, win
+    except Exception:
+        return None, None
+
+
+def connect_pos(cfg, layout=None):
+    """POS 메인 창에 연결 (캐시된 핸들 우선)"""
     from pywinauto import Application, findwindows
     keyword = cfg["window_title"]
 
+    if layout:
+        app, win = _connect_cached(keyword, layout)
+        if win:
+            print(f"[OK] POS 연결: {win.window_text()} ({layout['backend']}, 캐시)")
+            return app, win
+
     for backend in ["uia", "win32"]:
         try:
             app = Application(backend=backend).connect(title_re=f".*{keyword}.*", timeout=5)
@@ -106,6 +140,9 @@ def connect_pos(cfg):
             except Exception:
                 pass
             print(f"[OK] POS 연결: {win.window_text()} ({backend})")
+            # rois 등 pos_scan.py 가 기록한 항목은 유지
+            save_layout({**load_layout(), "backend": backend, "handle": win.handle,
+                         "title": win.window_text()})
             return app, win
         except Exception:
             pass
@@ -171,112 +208,56 @@ def capture_window_bg(hwnd):
     return img
 
 
-def read_order_count(win, cfg):
-    """배달+처리중 건수: 전체 창 OCR → 배달 행에서 처리중 카운트"""
-    import pytesseract
-    from PIL import Image, ImageOps
-
-    tesseract_path = cfg.get("tesseract_path", "")
-    if tesseract_path and os.path.exists(tesseract_path):
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+def read_order_count(win, cfg, timings=None, rows_out=None, mode=None, list_roi=None):
+    """배달+처리중 건수: 전체 창 OCR → 배달 행에서 처리중 카운트
 
+    timings: dict 전달 시 capture_ms / ocr_ms / rows_ocr 기록 (상태 조회용)
+    rows_out: list 전달 시 건수 산출에 쓰인 [(분류, 행 텍스트)] 추가 (주문 추적용)
+    mode: ResourceGovernor.mode() — {"scale", "invert", "roi"} (없으면 config 설정 그대로)
+    list_roi: 주문 목록 영역 [x, y, w, h] (layout rois.list) — 행 캐시 / roi 단계에서 사용
+    """
+    t0 = time.perf_counter()
     try:
         hwnd = win.handle
         img = capture_window_bg(hwnd)
     except Exception as e:
         print(f"[!] 캡처 실패: {e}")
         return None, None
+    t1 = time.perf_counter()
+    if timings is not None:
+        timings["capture_ms"] = round((t1 - t0) * 1000)
+
+    mode = mode or {}
+    # 창 크기가 바뀌어 저장된 목록 영역이 벗어나면 전체 창만 OCR
+    if list_roi and (list_roi[0] + list_roi[2] > img.size[0] or list_roi[1] + list_roi[3] > img.size[1]):
+        list_roi = None
 
-    # 전체 창 OCR
     try:
-        w, h = img.size
-        scaled = img.resize((w * 2, h * 2), Image.LANCZOS)
-        gray = scaled.convert("L")
-        bw = gray.point(lambda x: 255 if x > 128 else 0, "1")
-
-        text = pytesseract.image_to_string(bw, lang="kor+eng", config="--psm 6").strip()
-        count = _count_delivery_processing(text)
-        if count is not None:
-            return count, f"배달+처리중: {count}건"
-
-        # 반전 시도
-        inverted = ImageOps.invert(gray)
-        bw_inv = inverted.point(lambda x: 255 if x > 128 else 0, "1")
-        text2 = pytesseract.image_to_string(bw_inv, lang="kor+eng", config="--psm 6").strip()
-        count2 = _count_delivery_processing(text2)
-        if count2 is not None:
-            return count2, f"배달+처리중(inv): {count2}건"
+        count, matched = ocr_order_count(img, get_row_cache(cfg), timings, rows_out, get_matcher(cfg),
+                                         list_roi=list_roi, roi_only=bool(mode.get("roi")),
+                                         **ocr_params(cfg, mode))
+    finally:
+        if timings is not None:
+            timings["ocr_ms"] = round((time.perf_counter() - t1) * 1000)
+
+    if cfg["record_dir"]:
+        try:
+            from replay import record_frame
+            record_frame(cfg["record_dir"], img, count)
+        except Exception as e:
+            print(f"[!] 캡처 기록 실패: {e}")
 
-    except Exception as e:
-        print(f"[!] OCR 오류: {e}")
+    return count, matched
 
-    return None, None
 
+def update_gist(cfg, count, tracker=None, new_events=None):
+    """GitHub Gist에 주문 건수 (+ 주문별 스냅샷, 새 이벤트) 업데이트
+
+    order_status.json 은 매 폴링 갱신 (기존 count/time/source 유지)
+    order_events.json 은 새 이벤트가 있을 때만 갱신
+    """
+    import requests
 
-def _count_delivery_processing(text):
-    """OCR 텍스트에서 '배달' + 활성상태 조합 행 수 카운트"""
-    if not text:
-        return None
-
-    lines = text.split("\n")
-    delivery_found = False
-    count = 0
-    # 확실히 카운트: 처리중, 조리시작, 조리완료
-    active_kw = [
-        "처리중", "저리중", "처리종", "저디중",
-        "조리시작", "초리시작", "조리시직",
-        "조리완료", "초리완료", "조리완르",
-    ]
-    # 확실히 제외: 나머지 모든 상태 (카메라 리스트 기반)
-    exclude_kw = [
-        "완료", "완르",
-        "거절", "취소", "결제취소",
-        "픽업", "픽엄",
-        "배달중", "배닫중", "베달중",
-        "배차", "배처",
-        "조리대기", "초리대기",
-        "대기", "데기",
-        "로봇", "예약",
-    ]
-    header_kw = ["내점", "포장", "전체", "홀"]
-    for line in lines:
-        has_delivery = "배달" in line or "배닫" in line or "베달" in line
-        if not has_delivery:
-            continue
-
-        # 탭 바 감지 → 무조건 제외
-        tab_count = sum(1 for kw in header_kw if kw in line)
-        if tab_count >= 2:
-            print(f"  배달행[헤더]: {line.strip()[:100]}")
-            continue
-
-        # 컬럼 헤더 감지
-        if "주문번호" in line or "주문상태" in line:
-            print(f"  배달행[헤더]: {line.strip()[:100]}")
-            continue
-
-        delivery_found = True
-        # 1) 활성 키워드 → 카운트
-        if any(kw in line for kw in active_kw):
-            count += 1
-            print(f"  배달행[O]: {line.strip()[:100]}")
-        # 2) 제외 키워드 → 미카운트
-        elif any(kw in line for kw in exclude_kw):
-            print(f"  배달행[X]: {line.strip()[:100]}")
-        # 3) OCR 깨짐 → 카운트 (활성 추정)
-        else:
-            count += 1
-            print(f"  배달행[O?]: {line.strip()[:100]}")
-
-    # 배달 행이 하나라도 있었다면 유효한 카운트 (0 포함)
-    if delivery_found:
-        print(f"  배달 결과: {count}건")
-        return count
-    return None
-
-
-def update_gist(cfg, count):
-    """GitHub Gist에 주문 건수 업데이트"""
     token = cfg["github_token"]
     if not token:
         return False
@@ -286,51 +267,31 @@ def update_gist(cfg, count):
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
-    data = {
-        "files": {
-            "order_status.json": {
-                "content": json.dumps({
-                    "count": count,
-                    "time": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "source": "pc",
-                }, ensure_ascii=False)
-            }
-        }
+    status = {
+        "count": count,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "source": "pc",
     }
+    if tracker:
+        status.update(tracker.snapshot())
+    files = {"order_status.json": {"content": json.dumps(status, ensure_ascii=False)}}
+    if tracker and new_events:
+        files["order_events.json"] = {
+            "content": json.dumps(tracker.events_doc(), ensure_ascii=False)
+        }
 
     try:
-        resp = requests.patch(url, headers=headers, json=data, timeout=10)
+        resp = requests.patch(url, headers=headers, json={"files": files}, timeout=10)
         return resp.status_code == 200
     except Exception as e:
         print(f"[!] 네트워크 오류: {e}")
         return False
 
 
-def kill_old_instances():
-    """기존 인스턴스 종료 (PID 락 파일 기반)"""
-    if os.path.exists(LOCK_FILE):
-        try:
-            with open(LOCK_FILE, "r") as f:
-                old_pid = int(f.read().strip())
-            import signal
-            os.kill(old_pid, signal.SIGTERM)
-            print(f"[OK] 기존 인스턴스 종료 (PID {old_pid})")
-            time.sleep(1)
-        except (ProcessLookupError, ValueError):
-            pass
-        except Exception:
-            try:
-                os.system(f"taskkill /PID {old_pid} /F >nul 2>&1")
-            except Exception:
-                pass
-    with open(LOCK_FILE, "w") as f:
-        f.write(str(os.getpid()))
-
-
 SCRIPT_DIR_ROOT = os.path.dirname(SCRIPT_DIR)  # PosDelay/ 루트
 
 
-def auto_update():
+def auto_update(instance=None):
     """git pull 후 변경 있으면 자동 재시작"""
     try:
         result = subprocess.run(
@@ -345,13 +306,21 @@ def auto_update():
 
         # 변경 있음 → 재시작
         print(f"[{time.strftime('%H:%M:%S')}] 코드 업데이트 감지 → 재시작")
-        try:
-            os.remove(LOCK_FILE)
-        except Exception:
-            pass
 
+        # --restart: 새 프로세스가 락 해제를 잠시 기다림
+        # execv 는 성공하면 돌아오지 않음 → 직전에 락 해제, 실패하면 다시 잡고 계속 실행
         script = os.path.abspath(__file__)
-        os.execv(sys.executable, [sys.executable, script])
+        # 원래 인자(--headless 등) 유지, --restart 는 한 번만
+        args = [a for a in sys.argv[1:] if a != "--restart"]
+        if instance:
+            instance.release()
+        try:
+            os.execv(sys.executable, [sys.executable, script, *args, "--restart"])
+        except OSError:
+            if instance and not instance.acquire(wait_sec=5):
+                print(f"[{time.strftime('%H:%M:%S')}] [!] 재시작 실패 + 락 재획득 실패 → 종료")
+                sys.exit(1)
+            raise
 
     except subprocess.TimeoutExpired:
         print(f"[{time.strftime('%H:%M:%S')}] git pull 타임아웃")
@@ -359,54 +328,128 @@ def auto_update():
         print(f"[{time.strftime('%H:%M:%S')}] auto_update 실패: {e}")
 
 
+def reload_config(cfg, governor):
+    """config.json 변경 → (새 설정, 바뀐 키 목록). 잘못된 값은 기존 값 유지
+
+    Gist / 기록 폴더 / 행 캐시 / 템플릿 모델은 매 폴링 cfg 를 읽으므로 교체만으로 반영.
+    폴링 간격 / 창 제목은 호출 측 루프에서 처리
+    """
+    new, warnings = read_config(base=cfg)
+    for w in warnings:
+        print(f"[!] {w}")
+    keys = changed_keys(cfg, new)
+    if "tesseract_path" in keys:
+        set_tesseract_path(new)
+    if "ocr_threads" in keys:
+        set_ocr_threads(new["ocr_threads"])
+    governor.configure(new["cpu_budget_pct"], ocr_params(new)["scale"], new["low_scale"])
+    return new, keys
+
+
+def _pause_before_exit():
+    """콘솔 창이 바로 닫히지 않게 (무인 실행은 대기 없이 종료)"""
+    if not is_headless():
+        input("\n엔터를 누르면 종료...")
+
+
+def _log_ocr_to_console():
+    """OCR 파이프라인 로그 (ocr_pipeline.py) → 콘솔. 모니터 실행 시에만 (도구가 import 할 때는 조용히)"""
+    ocr_log = logging.getLogger("mate_monitor.ocr")
+    ocr_log.setLevel(logging.INFO)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("  %(message)s"))
+    ocr_log.addHandler(handler)
+
+
 def main():
-    kill_old_instances()
+    if "--status" in sys.argv:
+        print("\n".join(format_status(query_status(LOCK_FILE))))
+        return
+    if "--events" in sys.argv:
+        i = sys.argv.index("--events")
+        since = sys.argv[i + 1] if i + 1 < len(sys.argv) else "0"
+        print(json.dumps(query(LOCK_FILE, f"events {since}"), ensure_ascii=False, indent=2))
+        return
+
+    profile_only = "--profile-startup" in sys.argv
+    profile = StartupProfile()
+    instance = None
+    if profile_only:
+        profile.import_all()
+    else:
+        instance = SingleInstance(LOCK_FILE)
+        if not instance.acquire(wait_sec=15 if "--restart" in sys.argv else 0):
+            print("[!] 모니터가 이미 실행 중입니다 (재시작하지 않음)")
+            print("\n".join(format_status(query_status(LOCK_FILE))))
+            return
 
     print("=" * 50)
     print(f"  GENESIS BBQ POS 주문 모니터 (PID {os.getpid()})")
     print("=" * 50)
+    _log_ocr_to_console()
 
-    cfg = load_config()
+    with profile.stage("load_config"):
+        cfg = load_config()
 
     if not cfg["github_token"]:
-        print("\n[!] GitHub 토큰이 없습니다.")
-        print("  1. https://github.com/settings/tokens/new → gist 체크\n")
-        token = input("토큰 붙여넣기: ").strip()
-        if token:
-            cfg["github_token"] = token
-            save_config(cfg)
-        else:
-            print("[!] 토큰 필요"); return
-
-    # OCR 확인
-    try:
-        import pytesseract
-        tesseract_path = cfg.get("tesseract_path", "")
-        if tesseract_path and os.path.exists(tesseract_path):
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        ver = pytesseract.get_tesseract_version()
-        print(f"[OK] Tesseract {ver}")
-    except Exception:
-        print("[!] Tesseract OCR 필요!")
-        print("    https://github.com/UB-Mannheim/tesseract/wiki")
-        input("\n엔터를 누르면 종료...")
+        print("[!] GitHub 토큰 필요 (config.json github_token 또는 환경변수 POSDELAY_GITHUB_TOKEN)")
         return
 
-    # MATE POS 팝업 닫기
-    dismiss_popup()
+    # 우선순위 낮춤 + Tesseract 스레드 제한 (이후 실행되는 Tesseract 도 상속)
+    lower_priority(cfg["ocr_threads"])
+
+    # OCR 확인 (프로세스 실행) ∥ 팝업 닫기 + POS 연결
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        t_start = time.perf_counter()
+        tess_future = pool.submit(check_tesseract, cfg)
+
+        with profile.stage("dismiss_popup"):
+            dismiss_popup()
+
+        with profile.stage("connect_pos") as note:
+            layout = load_layout()
+            app, win = connect_pos(cfg, layout)
+            note["text"] = "캐시" if win and layout.get("handle") == win.handle else "탐색"
+
+        with profile.stage("tesseract 확인 (병렬)") as note:
+            try:
+                ver = tess_future.result()
+                print(f"[OK] Tesseract {ver}")
+                note["text"] = f"시작부터 {(time.perf_counter() - t_start) * 1000:.0f} ms"
+            except Exception:
+                print("[!] Tesseract OCR 필요!")
+                print("    https://github.com/UB-Mannheim/tesseract/wiki")
+                if profile_only:
+                    print("\n".join(profile.report()))
+                    return
+                _pause_before_exit()
+                return
+
+    if profile_only:
+        print("\n".join(profile.report()))
+        return
 
-    # POS 연결
-    app, win = connect_pos(cfg)
     if not win:
-        input("\n엔터를 누르면 종료...")
+        _pause_before_exit()
         return
 
-    # 초기 건수 확인
-    count, matched = read_order_count(win, cfg)
-    if count is not None:
-        print(f"[OK] 주문 건수: {count}건 ({matched})")
-    else:
-        print("[!] 건수 감지 실패")
+    # 상태 조회 서버 (두 번째 실행 / --status 에서 사용)
+    status = StatusServer()
+    instance.publish(port=status.start())
+    status.update(startup_ms=profile.as_dict())
+
+    # 주문별 상태 추적 (재시작해도 seq 이어짐)
+    tracker = OrderTracker(ORDER_STATE_FILE)
+    status.register("events", lambda arg: tracker.delta(int(arg or 0)))
+    # 건수/이벤트 시계열 누적 (order_stats.py 로 조회)
+    stats = OrderStats()
+    status.register("stats", lambda arg: stats.summary(int(arg or 7)))
+    # CPU 예산 초과 시 OCR 저비용 모드 (roi 단계는 pos_scan.py layout 으로 목록 영역 저장 시)
+    governor = ResourceGovernor(cfg["cpu_budget_pct"], scale=ocr_params(cfg)["scale"],
+                                low_scale=cfg["low_scale"], roi=layout.get("rois", {}).get("list"))
+    # config.json / layout_cache.json 변경 감시 → 재시작 없이 반영
+    # 템플릿 모델도 감시 → 재학습으로 덮어쓰거나 나중에 생긴 모델을 재시작 없이 로드
+    watcher = ConfigWatcher([CONFIG_FILE, LAYOUT_FILE, model_path(cfg)], cfg["config_check_sec"]).start()
 
     # 모니터링 루프
     interval = cfg["poll_interval_sec"]
@@ -422,7 +465,25 @@ def main():
             current_slot = t.tm_hour * 2 + (1 if t.tm_min >= 30 else 0)
             if current_slot != last_update_slot:
                 last_update_slot = current_slot
-                auto_update()  # 변경 있으면 여기서 재시작됨
+                auto_update(instance)  # 변경 있으면 여기서 재시작됨
+
+            # 설정 / 레이아웃 파일 변경 반영 (감시 스레드가 수정 시각만 확인)
+            changed_files = watcher.pop_changed()
+            if CONFIG_FILE in changed_files:
+                cfg, keys = reload_config(cfg, governor)
+                if keys:
+                    print(f"[{time.strftime('%H:%M:%S')}] 설정 변경 반영: {', '.join(keys)}")
+                    status.update(config_reloaded=time.strftime("%Y-%m-%d %H:%M:%S"), config_keys=keys)
+                interval = cfg["poll_interval_sec"]
+                watcher.check_sec = cfg["config_check_sec"]
+                if "window_title" in keys:
+                    win = None  # 아래에서 새 제목으로 재연결
+                if "status_model" in keys:
+                    watcher.watch(model_path(cfg))
+            if LAYOUT_FILE in changed_files:
+                governor.roi = load_layout().get("rois", {}).get("list")
+            if model_path(cfg) in changed_files:
+                reset_matcher()
 
             # 창 재연결
             try:
@@ -432,35 +493,59 @@ def main():
                 dismiss_popup()
                 app, win = connect_pos(cfg)
                 if not win:
-                    time.sleep(interval)
+                    watcher.wait(interval)
                     continue
 
             # 최소화 복원
             ensure_window_visible(win)
 
             # 건수 읽기
-            count, matched = read_order_count(win, cfg)
+            timings = {}
+            rows = []
+            count, matched = read_order_count(win, cfg, timings, rows, governor.mode(), governor.roi)
 
             if count is not None:
                 fail_count = 0
                 changed = count != last_count
                 if changed:
                     print(f"[{time.strftime('%H:%M:%S')}] 주문: {last_count}→{count}건 [{matched}]")
-                update_gist(cfg, count)
+                with status.lock:
+                    new_events = tracker.update(rows)
+                    stats.record_count(count)
+                    stats.record_events(new_events)
+                for ev in new_events:
+                    print(f"[{time.strftime('%H:%M:%S')}] 주문 {format_event(ev)}")
+                t_gist = time.perf_counter()
+                gist_ok = update_gist(cfg, count, tracker, new_events)
+                timings["gist_ms"] = round((time.perf_counter() - t_gist) * 1000)
                 last_count = count
+                status.update(last_count=count, matched=matched, gist_ok=gist_ok,
+                              seq=tracker.seq, orders=len(tracker.orders),
+                              throughput_1h=stats.throughput(1))
             else:
                 fail_count += 1
                 if fail_count % 10 == 1:
                     print(f"[{time.strftime('%H:%M:%S')}] 건수 감지 실패 ({fail_count}회)")
+            status.update(last_poll=time.strftime("%Y-%m-%d %H:%M:%S"),
+                          fail_count=fail_count, poll_ms=timings)
+            status.update(**pipeline_stats())
+            change = governor.update()
+            if change:
+                print(f"[{time.strftime('%H:%M:%S')}] {change}")
+            status.update(governor=governor.stats())
 
-            time.sleep(interval)
+            watcher.wait(interval)
 
         except KeyboardInterrupt:
             print("\n모니터링 종료")
             break
         except Exception as e:
             print(f"[!] 오류: {e}")
-            time.sleep(interval)
+            watcher.wait(interval)
+
+    watcher.close()
+    status.close()
+    instance.release()
 
 
 if __name__ == "__main__":
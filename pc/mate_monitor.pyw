@@ -5,6 +5,12 @@
 사용법:
   1. mate_monitor.py를 먼저 한번 실행 (config.json 생성)
   2. 더블클릭: mate_monitor.pyw (창 없이 백그라운드)
+  3. 시작 단계별 소요시간: pythonw mate_monitor.pyw --profile-startup (로그에 기록)
+  4. 실행 중인 모니터 상태: python mate_monitor.pyw --status
+     (이미 실행 중이면 두 번째 실행은 기존 모니터를 종료하지 않고 상태만 로그에 기록)
+  5. 주문 이벤트 조회 (seq 이후 변경분): python mate_monitor.pyw --events 120
+  6. config.json 대신 환경변수 POSDELAY_<설정키> 사용 가능 (예: POSDELAY_GITHUB_TOKEN)
+     실행 중 config.json 수정 → 재시작 없이 반영
 """
 
 import ctypes
@@ -17,12 +23,24 @@ import re
 import subprocess
 import sys
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from governor import ResourceGovernor, lower_priority, set_ocr_threads
+from layout_cache import LAYOUT_FILE, load_layout, save_layout
+from monitor_config import CONFIG_FILE, ConfigWatcher, changed_keys, load_config as read_config
+from ocr_pipeline import (
+    check_tesseract, get_matcher, get_row_cache, model_path, ocr_order_count, ocr_params, pipeline_stats,
+    reset_matcher, set_tesseract_path,
+)
+from order_events import OrderTracker, format_event
+from order_stats import OrderStats
+from single_instance import SingleInstance, StatusServer, format_status, query, query_status
+from startup_profile import StartupProfile
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
 LOG_FILE = os.path.join(SCRIPT_DIR, "monitor_log.txt")
 LOCK_FILE = os.path.join(SCRIPT_DIR, "monitor.lock")
+ORDER_STATE_FILE = os.path.join(SCRIPT_DIR, "order_state.json")
 
 log = logging.getLogger("mate_monitor")
 log.setLevel(logging.INFO)
@@ -32,26 +50,13 @@ _handler = logging.handlers.RotatingFileHandler(
 _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%Y-%m-%d %H:%M:%S"))
 log.addHandler(_handler)
 
-DEFAULT_CONFIG = {
-    "github_token": "",
-    "gist_id": "a67e5de3271d6d0716b276dc6a8391cb",
-    "window_title": "메인",
-    "delivery_tab_id": "198354",
-    "processing_tab_id": "133094",
-    "poll_interval_sec": 30,
-    "tesseract_path": r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-}
-
 
 def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-            for k, v in DEFAULT_CONFIG.items():
-                if k not in cfg:
-                    cfg[k] = v
-            return cfg
-    return None
+    """검증된 설정 (config.json + POSDELAY_* 환경변수, monitor_config.py). 입력 대기 없음"""
+    cfg, warnings = read_config()
+    for w in warnings:
+        log.warning(w)
+    return cfg
 
 
 def dismiss_popup():
@@ -78,9 +83,31 @@ def dismiss_popup():
         pass
 
 
-def connect_pos(cfg):
+def _connect_cached(keyword, layout):
+    """캐시된 핸들로 바로 연결 (descendants 탐색 생략). 실패 시 None"""
+    from pywinauto import Application
+    handle = layout.get("handle")
+    backend = layout.get("backend")
+    if not handle or backend not in ("uia", "win32"):
+        return None, None
+    try:
+        app = Application(backend=backend).connect(handle=handle, timeout=1)
+        win = app.window(handle=handle)
+        if keyword not in win.window_text():
+            return None, None
+        return app, win
+    except Exception:
+        return None, None
+
+
+def connect_pos(cfg, layout=None):
     from pywinauto import Application
     keyword = cfg["window_title"]
+    if layout:
+        app, win = _connect_cached(keyword, layout)
+        if win:
+            log.info(f"[OK] POS 연결: {win.window_text()} ({layout['backend']}, 캐시)")
+            return app, win
     for backend in ["uia", "win32"]:
         try:
             app = Application(backend=backend).connect(title_re=f".*{keyword}.*", timeout=5)
@@ -92,6 +119,9 @@ def connect_pos(cfg):
             except Exception:
                 pass
             log.info(f"[OK] POS 연결: {win.window_text()} ({backend})")
+            # rois 등 pos_scan.py 가 기록한 항목은 유지
+            save_layout({**load_layout(), "backend": backend, "handle": win.handle,
+                         "title": win.window_text()})
             return app, win
         except Exception:
             pass
@@ -114,21 +144,6 @@ def ensure_window_visible(win):
     return False
 
 
-_ocr_dump_count = 0
-
-def _log_ocr_text(text, label):
-    """OCR 결과 텍스트를 로그에 덤프 (디버깅용, 처음 5회만)"""
-    global _ocr_dump_count
-    if _ocr_dump_count >= 5:
-        return
-    _ocr_dump_count += 1
-    log.info(f"=== OCR 텍스트 ({label}) [{_ocr_dump_count}/5] ===")
-    for i, line in enumerate(text.split("\n")):
-        if line.strip():
-            log.info(f"  L{i}: {line.strip()}")
-    log.info("=== OCR 끝 ===")
-
-
 def capture_window_bg(hwnd):
     """PrintWindow API로 창이 가려져도 캡처"""
     import win32gui
@@ -164,133 +179,81 @@ def capture_window_bg(hwnd):
     return img
 
 
-def read_order_count(win, cfg):
-    """배달+처리중 건수: 전체 창 OCR → 배달 행에서 처리중 카운트"""
-    import pytesseract
-    from PIL import Image, ImageOps
 
-    tesseract_path = cfg.get("tesseract_path", "")
-    if tesseract_path and os.path.exists(tesseract_path):
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+def read_order_count(win, cfg, timings=None, rows_out=None, mode=None, list_roi=None):
+    """배달+처리중 건수: 전체 창 OCR → 배달 행에서 처리중 카운트
 
+    timings: dict 전달 시 capture_ms / ocr_ms / rows_ocr 기록 (상태 조회용)
+    rows_out: list 전달 시 건수 산출에 쓰인 [(분류, 행 텍스트)] 추가 (주문 추적용)
+    mode: ResourceGovernor.mode() — {"scale", "invert", "roi"} (없으면 config 설정 그대로)
+    list_roi: 주문 목록 영역 [x, y, w, h] (layout rois.list) — 행 캐시 / roi 단계에서 사용
+    """
+    t0 = time.perf_counter()
     try:
         hwnd = win.handle
         img = capture_window_bg(hwnd)
     except Exception as e:
         log.warning(f"캡처 실패: {e}")
         return None, None
+    t1 = time.perf_counter()
+    if timings is not None:
+        timings["capture_ms"] = round((t1 - t0) * 1000)
+
+    mode = mode or {}
+    # 창 크기가 바뀌어 저장된 목록 영역이 벗어나면 전체 창만 OCR
+    if list_roi and (list_roi[0] + list_roi[2] > img.size[0] or list_roi[1] + list_roi[3] > img.size[1]):
+        list_roi = None
 
-    # 전체 창 OCR
     try:
-        w, h = img.size
-        scaled = img.resize((w * 2, h * 2), Image.LANCZOS)
-        gray = scaled.convert("L")
-        bw = gray.point(lambda x: 255 if x > 128 else 0, "1")
-
-        text = pytesseract.image_to_string(bw, lang="kor+eng", config="--psm 6").strip()
-        _log_ocr_text(text, "normal")
-        count = _count_delivery_processing(text)
-        if count is not None:
-            return count, f"배달+처리중: {count}건"
-
-        # 반전 시도
-        inverted = ImageOps.invert(gray)
-        bw_inv = inverted.point(lambda x: 255 if x > 128 else 0, "1")
-        text2 = pytesseract.image_to_string(bw_inv, lang="kor+eng", config="--psm 6").strip()
-        _log_ocr_text(text2, "inverted")
-        count2 = _count_delivery_processing(text2)
-        if count2 is not None:
-            return count2, f"배달+처리중(inv): {count2}건"
+        count, matched = ocr_order_count(img, get_row_cache(cfg), timings, rows_out, get_matcher(cfg),
+                                         list_roi=list_roi, roi_only=bool(mode.get("roi")),
+                                         **ocr_params(cfg, mode))
+    finally:
+        if timings is not None:
+            timings["ocr_ms"] = round((time.perf_counter() - t1) * 1000)
+
+    if cfg["record_dir"]:
+        try:
+            from replay import record_frame
+            record_frame(cfg["record_dir"], img, count)
+        except Exception as e:
+            log.warning(f"캡처 기록 실패: {e}")
 
-    except Exception as e:
-        log.warning(f"OCR 오류: {e}")
+    return count, matched
 
-    return None, None
 
+def update_gist(cfg, count, tracker=None, new_events=None):
+    """GitHub Gist에 주문 건수 (+ 주문별 스냅샷, 새 이벤트) 업데이트
+
+    order_status.json 은 매 폴링 갱신 (기존 count/time/source 유지)
+    order_events.json 은 새 이벤트가 있을 때만 갱신
+    """
+    import requests
 
-def _count_delivery_processing(text):
-    """OCR 텍스트에서 '배달' + '처리중' 조합 행 수 카운트"""
-    if not text:
-        return None
-
-    lines = text.split("\n")
-    delivery_found = False
-    count = 0
-    # 확실히 카운트: 처리중, 조리시작, 조리완료
-    active_kw = [
-        "처리중", "저리중", "처리종", "저디중",
-        "조리시작", "초리시작", "조리시직",
-        "조리완료", "초리완료", "조리완르",
-    ]
-    # 확실히 제외: 나머지 모든 상태 (카메라 리스트 기반)
-    exclude_kw = [
-        "완료", "완르",          # 완료 (조리완료는 active에서 먼저 매칭)
-        "거절", "취소", "결제취소",
-        "픽업", "픽엄",
-        "배달중", "배닫중", "베달중",
-        "배차", "배처",
-        "조리대기", "초리대기",
-        "대기", "데기",
-        "로봇", "예약",
-    ]
-    header_kw = ["내점", "포장", "전체", "홀"]
-    for line in lines:
-        has_delivery = "배달" in line or "배닫" in line or "베달" in line
-        if not has_delivery:
-            continue
-
-        # 탭 바 감지 → 무조건 제외
-        tab_count = sum(1 for kw in header_kw if kw in line)
-        if tab_count >= 2:
-            log.info(f"배달행[헤더]: {line.strip()[:100]}")
-            continue
-
-        # 컬럼 헤더 감지
-        if "주문번호" in line or "주문상태" in line:
-            log.info(f"배달행[헤더]: {line.strip()[:100]}")
-            continue
-
-        delivery_found = True
-        # 1) 활성 키워드 있으면 → 카운트
-        if any(kw in line for kw in active_kw):
-            count += 1
-            log.info(f"배달행[O]: {line.strip()[:100]}")
-        # 2) 제외 키워드 있으면 → 미카운트
-        elif any(kw in line for kw in exclude_kw):
-            log.info(f"배달행[X]: {line.strip()[:100]}")
-        # 3) 아무 상태도 안 읽힘 (OCR 깨짐) → 카운트
-        else:
-            count += 1
-            log.info(f"배달행[O?]: {line.strip()[:100]}")
-
-    if delivery_found:
-        log.info(f"배달 결과: {count}건")
-        return count
-    return None
-
-
-def update_gist(cfg, count):
     token = cfg["github_token"]
     if not token:
         return False
+
     url = f"https://api.github.com/gists/{cfg['gist_id']}"
     headers = {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
-    data = {
-        "files": {
-            "order_status.json": {
-                "content": json.dumps({
-                    "count": count,
-                    "time": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "source": "pc",
-                }, ensure_ascii=False)
-            }
-        }
+    status = {
+        "count": count,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "source": "pc",
     }
+    if tracker:
+        status.update(tracker.snapshot())
+    files = {"order_status.json": {"content": json.dumps(status, ensure_ascii=False)}}
+    if tracker and new_events:
+        files["order_events.json"] = {
+            "content": json.dumps(tracker.events_doc(), ensure_ascii=False)
+        }
+
     try:
-        resp = requests.patch(url, headers=headers, json=data, timeout=10)
+        resp = requests.patch(url, headers=headers, json={"files": files}, timeout=10)
         return resp.status_code == 200
     except Exception as e:
         log.warning(f"[!] 네트워크 오류: {e}")
@@ -314,33 +277,7 @@ def register_startup():
         log.warning(f"[!] 시작프로그램 등록 실패: {e}")
 
 
-def kill_old_instances():
-    """기존 인스턴스 종료 (PID 락 파일 기반)"""
-    if os.path.exists(LOCK_FILE):
-        try:
-            with open(LOCK_FILE, "r") as f:
-                old_pid = int(f.read().strip())
-            # 기존 프로세스 강제 종료
-            import signal
-            os.kill(old_pid, signal.SIGTERM)
-            log.info(f"기존 인스턴스 종료 (PID {old_pid})")
-            time.sleep(1)
-        except (ProcessLookupError, ValueError):
-            pass  # 이미 종료됨
-        except Exception as e:
-            log.warning(f"기존 인스턴스 종료 실패: {e}")
-            # Windows에서는 taskkill 시도
-            try:
-                os.system(f"taskkill /PID {old_pid} /F >nul 2>&1")
-            except Exception:
-                pass
-
-    # 현재 PID 기록
-    with open(LOCK_FILE, "w") as f:
-        f.write(str(os.getpid()))
-
-
-def auto_update():
+def auto_update(instance=None):
     """git pull 후 변경 있으면 자동 재시작 (백그라운드)"""
     repo_dir = os.path.dirname(SCRIPT_DIR)  # PosDelay/ 루트
     try:
@@ -358,21 +295,20 @@ def auto_update():
         # 변경 있음 → 재시작
         log.info("코드 업데이트 감지 → 재시작")
 
-        # 락 파일 정리
-        try:
-            os.remove(LOCK_FILE)
-        except Exception:
-            pass
-
-        # pythonw로 백그라운드 재시작
+        # pythonw로 백그라운드 재시작 (새 프로세스는 --restart 로 락 해제까지 잠시 대기)
         pythonw = os.path.join(os.path.dirname(sys.executable), "pythonw.exe")
         if not os.path.exists(pythonw):
             pythonw = "pythonw"
         script = os.path.join(SCRIPT_DIR, "mate_monitor.pyw")
+        # 원래 인자(--headless 등) 유지, --restart 는 한 번만
+        args = [a for a in sys.argv[1:] if a != "--restart"]
         subprocess.Popen(
-            [pythonw, script],
+            [pythonw, script, *args, "--restart"],
             creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
         )
+        # 실행 성공 후에만 락 해제 (실패하면 예외 → 락 유지한 채 계속 실행)
+        if instance:
+            instance.release()
         sys.exit(0)
 
     except subprocess.TimeoutExpired:
@@ -381,45 +317,121 @@ def auto_update():
         log.warning(f"auto_update 실패: {e}")
 
 
+def reload_config(cfg, governor):
+    """config.json 변경 → (새 설정, 바뀐 키 목록). 잘못된 값은 기존 값 유지
+
+    Gist / 기록 폴더 / 행 캐시 / 템플릿 모델은 매 폴링 cfg 를 읽으므로 교체만으로 반영.
+    폴링 간격 / 창 제목은 호출 측 루프에서 처리
+    """
+    new, warnings = read_config(base=cfg)
+    for w in warnings:
+        log.warning(w)
+    keys = changed_keys(cfg, new)
+    if "tesseract_path" in keys:
+        set_tesseract_path(new)
+    if "ocr_threads" in keys:
+        set_ocr_threads(new["ocr_threads"])
+    governor.configure(new["cpu_budget_pct"], ocr_params(new)["scale"], new["low_scale"])
+    return new, keys
+
+
 def main():
-    kill_old_instances()
+    if "--status" in sys.argv:
+        print("\n".join(format_status(query_status(LOCK_FILE))))
+        return
+    if "--events" in sys.argv:
+        i = sys.argv.index("--events")
+        since = sys.argv[i + 1] if i + 1 < len(sys.argv) else "0"
+        print(json.dumps(query(LOCK_FILE, f"events {since}"), ensure_ascii=False, indent=2))
+        return
+
+    profile_only = "--profile-startup" in sys.argv
+    profile = StartupProfile()
+    instance = None
+    if profile_only:
+        profile.import_all()
+    else:
+        instance = SingleInstance(LOCK_FILE)
+        if not instance.acquire(wait_sec=15 if "--restart" in sys.argv else 0):
+            log.info("모니터가 이미 실행 중 (재시작하지 않음)")
+            for line in format_status(query_status(LOCK_FILE)):
+                log.info(line)
+            return
 
     log.info("=" * 40)
     log.info(f"  PosDelay PC 모니터 시작 (PID {os.getpid()})")
     log.info("=" * 40)
 
-    cfg = load_config()
-    if not cfg or not cfg.get("github_token"):
-        log.error("[!] config.json 없음. mate_monitor.py를 먼저 실행하세요.")
+    with profile.stage("load_config"):
+        cfg = load_config()
+    if not cfg["github_token"]:
+        log.error("[!] GitHub 토큰 없음. mate_monitor.py를 먼저 실행하거나 POSDELAY_GITHUB_TOKEN 설정")
         return
 
-    try:
-        import pytesseract
-        tesseract_path = cfg.get("tesseract_path", "")
-        if tesseract_path and os.path.exists(tesseract_path):
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        pytesseract.get_tesseract_version()
-        log.info("[OK] Tesseract OCR 확인")
-    except Exception:
-        log.error("[!] Tesseract OCR 없음. 종료.")
-        return
+    if not profile_only:
+        register_startup()
 
-    register_startup()
-    dismiss_popup()
+    # 우선순위 낮춤 + Tesseract 스레드 제한 (이후 실행되는 Tesseract 도 상속)
+    lower_priority(cfg["ocr_threads"])
 
-    app, win = None, None
-    for attempt in range(10):
-        dismiss_popup()
-        app, win = connect_pos(cfg)
-        if win:
-            break
-        log.info(f"[{attempt+1}/10] POS 대기 중...")
-        time.sleep(30)
+    # OCR 확인 (프로세스 실행) ∥ 팝업 닫기 + POS 연결
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        t_start = time.perf_counter()
+        tess_future = pool.submit(check_tesseract, cfg)
+
+        app, win = None, None
+        layout = load_layout()
+        for attempt in range(1 if profile_only else 10):
+            with profile.stage("dismiss_popup"):
+                dismiss_popup()
+            with profile.stage("connect_pos") as note:
+                app, win = connect_pos(cfg, layout)
+                note["text"] = "캐시" if win and layout.get("handle") == win.handle else "탐색"
+            if win:
+                break
+            # Tesseract 없으면 POS 대기 없이 바로 종료
+            if tess_future.done() and tess_future.exception():
+                break
+            log.info(f"[{attempt+1}/10] POS 대기 중...")
+            time.sleep(30)
+
+        with profile.stage("tesseract 확인 (병렬)") as note:
+            try:
+                tess_future.result()
+                log.info("[OK] Tesseract OCR 확인")
+                note["text"] = f"시작부터 {(time.perf_counter() - t_start) * 1000:.0f} ms"
+            except Exception:
+                log.error("[!] Tesseract OCR 없음. 종료.")
+                if not profile_only:
+                    return
+
+    if profile_only:
+        for line in profile.report():
+            log.info(line)
+        return
 
     if not win:
         log.error("[!] POS 연결 실패. 종료.")
         return
 
+    # 상태 조회 서버 (두 번째 실행 / --status 에서 사용)
+    status = StatusServer()
+    instance.publish(port=status.start())
+    status.update(startup_ms=profile.as_dict())
+
+    # 주문별 상태 추적 (재시작해도 seq 이어짐)
+    tracker = OrderTracker(ORDER_STATE_FILE)
+    status.register("events", lambda arg: tracker.delta(int(arg or 0)))
+    # 건수/이벤트 시계열 누적 (order_stats.py 로 조회)
+    stats = OrderStats()
+    status.register("stats", lambda arg: stats.summary(int(arg or 7)))
+    # CPU 예산 초과 시 OCR 저비용 모드 (roi 단계는 pos_scan.py layout 으로 목록 영역 저장 시)
+    governor = ResourceGovernor(cfg["cpu_budget_pct"], scale=ocr_params(cfg)["scale"],
+                                low_scale=cfg["low_scale"], roi=layout.get("rois", {}).get("list"))
+    # config.json / layout_cache.json 변경 감시 → 재시작 없이 반영
+    # 템플릿 모델도 감시 → 재학습으로 덮어쓰거나 나중에 생긴 모델을 재시작 없이 로드
+    watcher = ConfigWatcher([CONFIG_FILE, LAYOUT_FILE, model_path(cfg)], cfg["config_check_sec"]).start()
+
     interval = cfg["poll_interval_sec"]
     log.info(f"모니터링 시작 ({interval}초 간격, 매 정각 자동업데이트)")
 
@@ -433,7 +445,25 @@ def main():
             current_slot = t.tm_hour * 2 + (1 if t.tm_min >= 30 else 0)
             if current_slot != last_update_slot:
                 last_update_slot = current_slot
-                auto_update()  # 변경 있으면 여기서 재시작됨
+                auto_update(instance)  # 변경 있으면 여기서 재시작됨
+
+            # 설정 / 레이아웃 파일 변경 반영 (감시 스레드가 수정 시각만 확인)
+            changed_files = watcher.pop_changed()
+            if CONFIG_FILE in changed_files:
+                cfg, keys = reload_config(cfg, governor)
+                if keys:
+                    log.info(f"설정 변경 반영: {', '.join(keys)}")
+                    status.update(config_reloaded=time.strftime("%Y-%m-%d %H:%M:%S"), config_keys=keys)
+                interval = cfg["poll_interval_sec"]
+                watcher.check_sec = cfg["config_check_sec"]
+                if "window_title" in keys:
+                    win = None  # 아래에서 새 제목으로 재연결
+                if "status_model" in keys:
+                    watcher.watch(model_path(cfg))
+            if LAYOUT_FILE in changed_files:
+                governor.roi = load_layout().get("rois", {}).get("list")
+            if model_path(cfg) in changed_files:
+                reset_matcher()
 
             try:
                 win.window_text()
@@ -442,39 +472,58 @@ def main():
                 dismiss_popup()
                 app, win = connect_pos(cfg)
                 if not win:
-                    time.sleep(interval)
+                    watcher.wait(interval)
                     continue
 
             ensure_window_visible(win)
 
-            count, matched = read_order_count(win, cfg)
+            timings = {}
+            rows = []
+            count, matched = read_order_count(win, cfg, timings, rows, governor.mode(), governor.roi)
 
             if count is not None:
                 fail_count = 0
                 changed = count != last_count
                 if changed:
                     log.info(f"주문: {last_count}→{count}건 [{matched}]")
-                update_gist(cfg, count)
+                with status.lock:
+                    new_events = tracker.update(rows)
+                    stats.record_count(count)
+                    stats.record_events(new_events)
+                for ev in new_events:
+                    log.info(f"주문 {format_event(ev)}")
+                t_gist = time.perf_counter()
+                gist_ok = update_gist(cfg, count, tracker, new_events)
+                timings["gist_ms"] = round((time.perf_counter() - t_gist) * 1000)
                 last_count = count
+                status.update(last_count=count, matched=matched, gist_ok=gist_ok,
+                              seq=tracker.seq, orders=len(tracker.orders),
+                              throughput_1h=stats.throughput(1))
             else:
                 fail_count += 1
                 if fail_count % 10 == 1:
                     log.warning(f"건수 감지 실패 ({fail_count}회)")
+            status.update(last_poll=time.strftime("%Y-%m-%d %H:%M:%S"),
+                          fail_count=fail_count, poll_ms=timings)
+            status.update(**pipeline_stats())
+            change = governor.update()
+            if change:
+                log.info(change)
+            status.update(governor=governor.stats())
 
-            time.sleep(interval)
+            watcher.wait(interval)
 
         except KeyboardInterrupt:
             log.info("모니터링 종료")
             break
         except Exception as e:
             log.error(f"오류: {e}")
-            time.sleep(interval)
+            watcher.wait(interval)
 
-    # 종료 시 락 파일 정리
-    try:
-        os.remove(LOCK_FILE)
-    except Exception:
-        pass
+    # 종료 시 락 해제
+    watcher.close()
+    status.close()
+    instance.release()
 
 
 if __name__ == "__main__":
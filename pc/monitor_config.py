@@ -0,0 +1,246 @@
+"""
+모니터 설정: config.json + 환경변수 → 검증된 설정 dict (시작 시 1회) + 실행 중 변경 감시
+
+- 키마다 타입 / 허용값 / 최솟값 검사. 잘못된 값은 기본값(재로드 시 기존 값) 유지 + 경고
+- 환경변수 POSDELAY_<키 대문자> 가 config.json 보다 우선 → 무인 PC 는 파일 없이도 실행 가능
+    예) POSDELAY_GITHUB_TOKEN=ghp_... / POSDELAY_POLL_INTERVAL_SEC=20 / POSDELAY_ROW_CACHE=false
+- 비대화식: --headless / POSDELAY_HEADLESS=1 / 콘솔 없음 → 첫 실행 안내(input) 없이 오류만 보고
+- ConfigWatcher: config.json / layout_cache.json / 템플릿 모델 수정 시각을 백그라운드에서 확인
+  → 바뀐 경우에만 다시 읽어 폴링 간격 / ROI / Gist·기록 대상 / 재학습한 모델 등을 재시작 없이 반영
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
+ENV_PREFIX = "POSDELAY_"
+
+RESAMPLE_FILTERS = ("nearest", "bilinear", "bicubic", "lanczos")
+
+# 키 → (기본값, 타입[, 최솟값]). 타입: str / int / float / bool / 허용값 tuple / "threshold"
+FIELDS = {
+    "github_token": ("", str),
+    "gist_id": ("a67e5de3271d6d0716b276dc6a8391cb", str),
+    "window_title": ("메인", str),
+    "delivery_tab_id": ("198354", str),
+    "processing_tab_id": ("133094", str),
+    "list_pane_id": ("198666", str),
+    "poll_interval_sec": (30, int, 1),
+    "tesseract_path": (r"C:\Program Files\Tesseract-OCR\tesseract.exe", str),
+    "row_cache": (True, bool),                   # 행 단위 OCR 캐시 (바뀐 행만 OCR)
+    "row_cache_max_entries": (512, int, 1),
+    "row_cache_max_mb": (2, float, 0.1),
+    "record_dir": ("", str),                     # 지정 시 매 폴링 캡처 저장 (replay.py)
+    "status_model": ("status_model.npz", str),   # 템플릿 인식 모델 (status_matcher.py, rois.list 필요, 없으면 OCR만)
+    "cpu_budget_pct": (10, float, 0),            # PC 전체 CPU 대비 OCR 허용 점유율, 초과 시 저비용 모드 (0: 끔)
+    "ocr_threads": (1, int, 0),                  # Tesseract 스레드 수 (OMP_THREAD_LIMIT, 0: 제한 없음)
+    "low_scale": (1.5, float, 0.5),              # 저비용 모드 확대 배율
+    # OCR 전처리 / 인식 설정 (tune_ocr.py 가 기록된 캡처로 자동 조정)
+    "ocr_scale": (2, float, 0.5),                # 확대 배율
+    "ocr_resample": ("lanczos", RESAMPLE_FILTERS),
+    "ocr_threshold": (128, "threshold"),         # 이진화 기준값 (0~255) 또는 "otsu"
+    "ocr_psm": (6, (3, 4, 6)),                   # Tesseract 페이지 분할 모드 (여러 줄 블록)
+    "ocr_invert": (True, bool),                  # 인식 실패 시 반전 이미지로 재시도
+    "config_check_sec": (5, float, 1),           # config.json / layout_cache.json 변경 확인 주기
+}
+DEFAULT_CONFIG = {k: spec[0] for k, spec in FIELDS.items()}
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off", "")
+
+
+def _number(value):
+    if isinstance(value, bool):
+        raise ValueError("숫자")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("숫자") from None
+
+
+def _coerce(value, kind, minimum=None):
+    """값 1개 → 선언된 타입 (환경변수 문자열 포함). 잘못되면 ValueError"""
+    if kind == "threshold":
+        if value == "otsu":
+            return value
+        number = _number(value)
+        if number != int(number) or not 0 <= number <= 255:
+            raise ValueError("0~255 또는 otsu")
+        return int(number)
+    if isinstance(kind, tuple):
+        for allowed in kind:
+            if str(value).lower() == str(allowed):
+                return allowed
+        raise ValueError(" / ".join(str(a) for a in kind) + " 중 하나")
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in _TRUE:
+            return True
+        if str(value).lower() in _FALSE:
+            return False
+        raise ValueError("true / false")
+    if kind is str:
+        if isinstance(value, (dict, list)):
+            raise ValueError("문자열")
+        return str(value)
+    number = _number(value)
+    if kind is int:
+        if number != int(number):
+            raise ValueError("정수")
+        number = int(number)
+    elif number == int(number):
+        number = int(number)  # 2.0 → 2 (파일 / 로그 표기 유지)
+    if minimum is not None and number < minimum:
+        raise ValueError(f"{minimum} 이상")
+    return number
+
+
+def validate(raw, base=None):
+    """원본 dict → (검증된 설정, 경고 목록). 잘못된 키는 base(없으면 기본값) 값 유지
+
+    모르는 키는 그대로 통과 (다른 도구가 기록한 값)
+    """
+    base = base or DEFAULT_CONFIG
+    cfg = dict(raw)
+    warnings = []
+    for key, spec in FIELDS.items():
+        if key not in raw:
+            cfg[key] = base.get(key, spec[0])
+            continue
+        try:
+            cfg[key] = _coerce(raw[key], *spec[1:])
+        except (TypeError, ValueError) as e:
+            cfg[key] = base.get(key, spec[0])
+            warnings.append(f"설정 {key}={raw[key]!r} 무시 ({e}) → {cfg[key]!r}")
+    path = cfg["tesseract_path"]
+    if path and not os.path.exists(path):
+        warnings.append(f"tesseract_path 없음: {path} → PATH 의 tesseract 사용")
+        cfg["tesseract_path"] = ""
+    return cfg, warnings
+
+
+def read_file(path=CONFIG_FILE):
+    """config.json 원본 (없으면 빈 dict). 깨진 JSON 은 ValueError"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise ValueError("config.json 최상위는 객체여야 함")
+    return raw
+
+
+def env_overrides(environ=None):
+    """POSDELAY_<KEY> 환경변수 → {key: 문자열 값}"""
+    environ = os.environ if environ is None else environ
+    return {key: environ[ENV_PREFIX + key.upper()]
+            for key in FIELDS if ENV_PREFIX + key.upper() in environ}
+
+
+def load_config(path=CONFIG_FILE, base=None, environ=None):
+    """config.json + 환경변수 → (검증된 설정, 경고 목록). 입력 대기 없음
+
+    파일이 깨졌으면 경고 후 base(없으면 기본값) + 환경변수로 진행
+    """
+    warnings = []
+    try:
+        raw = read_file(path)
+    except (OSError, ValueError) as e:
+        warnings.append(f"{os.path.basename(path)} 읽기 실패: {e}")
+        raw = dict(base or {})
+    cfg, more = validate({**raw, **env_overrides(environ)}, base)
+    return cfg, warnings + more
+
+
+def save_config(updates, path=CONFIG_FILE):
+    """config.json 에 지정 키만 덮어쓰기 (환경변수 값은 파일에 남기지 않음)"""
+    try:
+        raw = read_file(path)
+    except ValueError:
+        raw = {}
+    raw.update(updates)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(raw, f, indent=2, ensure_ascii=False)
+
+
+def is_headless(argv=None):
+    """첫 실행 안내(input) 를 띄울 수 없는 실행인지"""
+    argv = sys.argv if argv is None else argv
+    if "--headless" in argv:
+        return True
+    if os.environ.get(ENV_PREFIX + "HEADLESS", "").lower() in _TRUE:
+        return True
+    return sys.stdin is None or not sys.stdin.isatty()
+
+
+def changed_keys(old, new):
+    return sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ConfigWatcher:
+    """감시 파일 수정 시각 확인 스레드
+
+    check_sec 마다 stat 만 (내용은 바뀐 경우에만 호출 측에서 다시 읽음).
+    폴링 루프는 time.sleep 대신 wait() → 파일이 바뀌면 즉시 깨어나 반영
+    """
+
+    def __init__(self, paths, check_sec=5):
+        self.paths = [p for p in paths if p]
+        self.check_sec = check_sec
+        self._mtimes = {p: _mtime(p) for p in self.paths}
+        self._changed = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def watch(self, path):
+        """감시 파일 추가 (설정 변경으로 경로가 바뀐 경우). 없는 파일도 생기면 변경으로 감지"""
+        if path and path not in self._mtimes:
+            self._mtimes[path] = _mtime(path)
+            self.paths = self.paths + [path]  # 감시 스레드는 교체된 목록을 다음 확인부터 사용
+
+    def start(self):
+        threading.Thread(target=self._run, name="config-watch", daemon=True).start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.check_sec):
+            for path in self.paths:
+                m = _mtime(path)
+                if m != self._mtimes[path]:
+                    self._mtimes[path] = m
+                    with self._lock:
+                        self._changed.add(path)
+                        self._wake.set()
+
+    def wait(self, timeout):
+        """timeout 초 대기. 감시 파일이 바뀌면 즉시 반환 (Windows 에서도 Ctrl+C 받도록 1초씩)"""
+        end = time.monotonic() + timeout
+        while not self._wake.is_set():
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wake.wait(min(remaining, 1))
+
+    def pop_changed(self):
+        """마지막 호출 이후 바뀐 파일 경로 집합"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            self._wake.clear()
+        return changed
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,338 @@
+"""
+캡처 이미지 → 배달+처리중 건수 (mate_monitor.py / .pyw / tune_ocr.py / bench_row_cache.py 공용)
+
+순서: 행 경로(캐시 / 템플릿 인식) → 전체 OCR → 반전 OCR
+행 경로는 주문 목록 영역(layout rois.list, pos_scan.py layout) 이 있어야 사용.
+"row_cache": false 여도 템플릿 모델이 있으면 행 경로 (캐시 없이 템플릿 → 못 읽은 행만 OCR)
+전처리(배율 / 리샘플 / 이진화)와 PSM 은 config "ocr_*" (ocr_params)
+
+로그는 "mate_monitor.ocr" 로거 → .pyw 는 monitor_log.txt, .py 는 콘솔
+"""
+
+import logging
+import os
+
+log = logging.getLogger("mate_monitor.ocr")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 확실히 카운트: 처리중, 조리시작, 조리완료
+ACTIVE_KW = [
+    "처리중", "저리중", "처리종", "저디중",
+    "조리시작", "초리시작", "조리시직",
+    "조리완료", "초리완료", "조리완르",
+]
+# 확실히 제외: 나머지 모든 상태 (카메라 리스트 기반)
+EXCLUDE_KW = [
+    "완료", "완르",          # 완료 (조리완료는 active에서 먼저 매칭)
+    "거절", "취소", "결제취소",
+    "픽업", "픽엄",
+    "배달중", "배닫중", "베달중",
+    "배차", "배처",
+    "조리대기", "초리대기",
+    "대기", "데기",
+    "로봇", "예약",
+]
+HEADER_KW = ["내점", "포장", "전체", "홀"]
+
+# 전체 / 반전 OCR 텍스트 로그 덤프 횟수 (디버깅용, 처음 몇 번만)
+OCR_DUMP_LIMIT = 5
+
+_row_cache = None
+_matcher = None
+_matcher_path = None
+_matcher_checked = None
+_ocr_dump_count = 0
+_warned_no_roi = False
+
+
+def set_tesseract_path(cfg):
+    """pytesseract 실행 파일 지정 — 시작 / 설정 변경 시에만 (경로 확인은 설정 검증에서 1회)"""
+    import pytesseract
+    pytesseract.pytesseract.tesseract_cmd = cfg["tesseract_path"] or "tesseract"
+
+
+def check_tesseract(cfg):
+    """Tesseract 실행 확인 → 버전 문자열 (실패 시 예외)"""
+    import pytesseract
+    set_tesseract_path(cfg)
+    return str(pytesseract.get_tesseract_version())
+
+
+def get_row_cache(cfg):
+    """행 OCR 캐시 (config "row_cache": false 이면 None)"""
+    global _row_cache
+    if not cfg["row_cache"]:
+        return None
+    if _row_cache is None:
+        from row_cache import RowOcrCache
+        _row_cache = RowOcrCache()
+    # 실행 중 설정 변경도 반영 (줄어든 상한은 다음 추가 시 축출)
+    _row_cache.max_entries = cfg["row_cache_max_entries"]
+    _row_cache.max_bytes = int(cfg["row_cache_max_mb"] * 1024 * 1024)
+    return _row_cache
+
+
+def model_path(cfg):
+    """config "status_model" → 절대 경로 (상대 경로는 스크립트 폴더 기준, 비어 있으면 "")"""
+    path = cfg["status_model"]
+    if path and not os.path.isabs(path):
+        path = os.path.join(SCRIPT_DIR, path)
+    return path
+
+
+def reset_matcher():
+    """모델 파일이 바뀌었거나 새로 생김 (ConfigWatcher) → 다음 get_matcher 에서 다시 로드"""
+    global _matcher_path
+    _matcher_path = None
+
+
+def get_matcher(cfg):
+    """템플릿 인식기 (모델 파일 없거나 numpy 없으면 None → Tesseract 만 사용)
+
+    경로가 같으면 캐시된 인식기. 파일 재학습 / 생성은 호출 측 감시(ConfigWatcher) → reset_matcher()
+    """
+    global _matcher, _matcher_path
+    path = model_path(cfg)
+    if path != _matcher_path:
+        _matcher_path = path
+        _matcher = None
+        if path and os.path.exists(path):
+            try:
+                from status_matcher import StatusMatcher
+                _matcher = StatusMatcher(path)
+                log.info(f"템플릿 인식기: {os.path.basename(path)} (배율 x{_matcher.scale:g}, "
+                         f"주문 목록 영역 rois.list 필요)")
+            except Exception as e:
+                log.warning(f"템플릿 인식기 비활성: {e}")
+    if _matcher is not None:
+        _check_matcher_prep(cfg)
+    return _matcher
+
+
+def _check_matcher_prep(cfg):
+    """모델 학습 전처리 ≠ config "ocr_*" 이면 1회 경고 (조합이 바뀔 때마다 다시)"""
+    global _matcher_checked
+    want = {k: cfg[f"ocr_{k}"] for k in ("scale", "resample", "threshold")}
+    key = (id(_matcher), tuple(want.values()))
+    if key == _matcher_checked:
+        return
+    _matcher_checked = key
+    if _matcher.prep != want:
+        have = _matcher.prep
+        log.warning(f"템플릿 모델 전처리 x{have['scale']:g} {have['resample']} thr {have['threshold']} "
+                    f"≠ config x{want['scale']:g} {want['resample']} thr {want['threshold']} "
+                    f"→ 행 대부분 Tesseract 대체 (status_matcher.py extract / train 다시)")
+
+
+def pipeline_stats():
+    """상태 조회용: 사용 중인 행 캐시 / 템플릿 인식기 통계"""
+    out = {}
+    if _row_cache is not None:
+        out["row_cache"] = _row_cache.stats()
+    if _matcher is not None:
+        out["matcher"] = {"hits": _matcher.hits, "fallbacks": _matcher.fallbacks}
+    return out
+
+
+OCR_PARAMS = ("scale", "resample", "threshold", "psm", "invert")
+
+
+def ocr_params(cfg, mode=None):
+    """config "ocr_*" (+ 거버너 저비용 모드) → ocr_order_count 키워드 인자"""
+    params = {k: cfg[f"ocr_{k}"] for k in OCR_PARAMS}
+    if mode:
+        # 저배율은 전체 OCR 에만. 행 경로는 config 배율 유지 (템플릿 배율 / 캐시 키 그대로)
+        params["full_scale"] = min(params["scale"], mode["scale"])
+        params["invert"] = params["invert"] and mode["invert"]
+    return params
+
+
+def _otsu(gray):
+    """회색조 히스토그램 → 클래스 간 분산 최대 기준값"""
+    hist = gray.histogram()
+    total = sum(hist)
+    sum_all = sum(i * n for i, n in enumerate(hist))
+    w0 = s0 = 0
+    best, best_t = -1.0, 128
+    for t, n in enumerate(hist):
+        w0 += n
+        s0 += t * n
+        w1 = total - w0
+        if w0 == 0 or w1 == 0:
+            continue
+        var = w0 * w1 * (s0 / w0 - (sum_all - s0) / w1) ** 2
+        if var > best:
+            best, best_t = var, t
+    return best_t
+
+
+def _binarize(gray, threshold):
+    t = _otsu(gray) if threshold == "otsu" else int(threshold)
+    return gray.point(lambda x: 255 if x > t else 0, "1")
+
+
+def preprocess(img, scale=2, resample="lanczos", threshold=128):
+    """캡처 → (확대 회색조, 이진 이미지)"""
+    from PIL import Image
+
+    if scale != 1:
+        w, h = img.size
+        filters = {"nearest": Image.NEAREST, "bilinear": Image.BILINEAR,
+                   "bicubic": Image.BICUBIC, "lanczos": Image.LANCZOS}
+        img = img.resize((round(w * scale), round(h * scale)), filters[resample])
+    gray = img.convert("L")
+    return gray, _binarize(gray, threshold)
+
+
+def _log_ocr_text(text, label):
+    """OCR 결과 텍스트를 로그에 덤프 (처음 OCR_DUMP_LIMIT 회만)"""
+    global _ocr_dump_count
+    if _ocr_dump_count >= OCR_DUMP_LIMIT:
+        return
+    _ocr_dump_count += 1
+    log.info(f"=== OCR 텍스트 ({label}) [{_ocr_dump_count}/{OCR_DUMP_LIMIT}] ===")
+    for i, line in enumerate(text.split("\n")):
+        if line.strip():
+            log.info(f"  L{i}: {line.strip()}")
+    log.info("=== OCR 끝 ===")
+
+
+def _warn_no_roi():
+    global _warned_no_roi
+    if not _warned_no_roi:
+        _warned_no_roi = True
+        log.warning("행 캐시 / 템플릿 인식: 주문 목록 영역(rois.list) 없음 → 전체 OCR (python pos_scan.py layout 으로 저장)")
+
+
+def ocr_order_count(img, row_cache=None, timings=None, rows_out=None, matcher=None,
+                    scale=2, resample="lanczos", threshold=128, psm=6, invert=True,
+                    list_roi=None, roi_only=False, full_scale=None):
+    """캡처 이미지 → (건수, 설명). 행 캐시(+템플릿 인식) → 전체 OCR → 반전 OCR 순서
+
+    scale / resample / threshold / psm: 전처리·인식 설정 (ocr_params)
+    invert: False 면 반전 재시도 생략
+    list_roi: 주문 목록 영역 [x, y, w, h] (창 기준). 행 캐시 / 템플릿 인식은 이 안의 행만 사용
+    roi_only: 목록 영역만 잘라 전처리 / OCR (거버너 roi 단계)
+    full_scale: 전체 / 반전 OCR 배율 (None 이면 scale, 거버너 low_scale 단계). 행 경로는 항상 scale
+    """
+    import pytesseract
+    from PIL import ImageOps
+
+    try:
+        box = None
+        x_offset = 0
+        if list_roi:
+            x, y, w, h = list_roi
+            if roi_only:
+                img = img.crop((x, y, x + w, y + h))
+                x_offset, x, y = round(x * scale), 0, 0
+            box = tuple(round(v * scale) for v in (x, y, x + w, y + h))
+
+        full_scale = scale if full_scale is None else full_scale
+        tess_config = f"--psm {psm}"
+        bw = None
+
+        # 행 경로: 목록 영역에서 캐시 / 템플릿으로 못 읽은 행만 OCR
+        use_rows = row_cache is not None or matcher is not None
+        if use_rows and box is None:
+            _warn_no_roi()
+        elif use_rows:
+            from row_cache import read_rows
+            gray, bw = preprocess(img, scale, resample, threshold)
+            rows, n_ocr = read_rows(bw, box, row_cache, _classify_line, matcher,
+                                    scale=scale, psm=psm, x_offset=x_offset)
+            if timings is not None:
+                timings["rows_ocr"] = n_ocr
+                timings["rows"] = len(rows)
+            count = _count_classified(rows)
+            if count is not None:
+                if rows_out is not None:
+                    rows_out.extend(rows)
+                return count, f"배달+처리중: {count}건 (행 {len(rows)}개 중 {n_ocr}개 OCR)"
+
+        if bw is None or full_scale != scale:
+            gray, bw = preprocess(img, full_scale, resample, threshold)
+
+        text = pytesseract.image_to_string(bw, lang="kor+eng", config=tess_config).strip()
+        _log_ocr_text(text, "normal")
+        count = _count_delivery_processing(text, rows_out)
+        if count is not None:
+            return count, f"배달+처리중: {count}건"
+
+        if not invert:
+            return None, None
+
+        # 반전 시도
+        inverted = ImageOps.invert(gray)
+        bw_inv = _binarize(inverted, threshold)
+        text2 = pytesseract.image_to_string(bw_inv, lang="kor+eng", config=tess_config).strip()
+        _log_ocr_text(text2, "inverted")
+        count2 = _count_delivery_processing(text2, rows_out)
+        if count2 is not None:
+            return count2, f"배달+처리중(inv): {count2}건"
+
+    except Exception as e:
+        log.warning(f"OCR 오류: {e}")
+
+    return None, None
+
+
+def _classify_line(line):
+    """OCR 한 줄 분류 → None(배달행 아님) / header / active / excluded / guess"""
+    has_delivery = "배달" in line or "배닫" in line or "베달" in line
+    if not has_delivery:
+        return None
+
+    # 탭 바 감지 → 무조건 제외
+    tab_count = sum(1 for kw in HEADER_KW if kw in line)
+    if tab_count >= 2:
+        return "header"
+
+    # 컬럼 헤더 감지
+    if "주문번호" in line or "주문상태" in line:
+        return "header"
+
+    # 1) 활성 키워드 → 카운트
+    if any(kw in line for kw in ACTIVE_KW):
+        return "active"
+    # 2) 제외 키워드 → 미카운트
+    if any(kw in line for kw in EXCLUDE_KW):
+        return "excluded"
+    # 3) OCR 깨짐 → 카운트 (활성 추정)
+    return "guess"
+
+
+_KIND_LABEL = {"header": "헤더", "active": "O", "excluded": "X", "guess": "O?"}
+
+
+def _count_classified(rows):
+    """[(분류, 텍스트)] → 배달 활성 행 수 (배달 행 없으면 None)"""
+    delivery_found = False
+    count = 0
+    for kind, line in rows:
+        if kind is None:
+            continue
+        log.info(f"배달행[{_KIND_LABEL[kind]}]: {line.strip()[:100]}")
+        if kind == "header":
+            continue
+        delivery_found = True
+        if kind in ("active", "guess"):
+            count += 1
+
+    # 배달 행이 하나라도 있었다면 유효한 카운트 (0 포함)
+    if delivery_found:
+        log.info(f"배달 결과: {count}건")
+        return count
+    return None
+
+
+def _count_delivery_processing(text, rows_out=None):
+    """OCR 텍스트에서 '배달' + 활성상태 조합 행 수 카운트"""
+    if not text:
+        return None
+    rows = [(_classify_line(line), line) for line in text.split("\n")]
+    count = _count_classified(rows)
+    if count is not None and rows_out is not None:
+        rows_out.extend(rows)
+    return count
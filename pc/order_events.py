@@ -0,0 +1,214 @@
+"""
+주문 행 → 주문별 상태 추적 + 증분 이벤트 로그
+
+- OCR 행 텍스트에서 주문번호 / 주문타입 / 주문상태 추출 (OCR 오타 정규화)
+- 폴링 간 주문번호로 같은 주문 추적 → 안정 ID: "YYYYMMDD-주문번호"
+- 변화만 이벤트로 기록 (seq 단조 증가, 재시작해도 이어짐)
+    created   새 주문 등장
+    advanced  상태 변경 (prev → status)
+    completed 종료 상태(완료/취소/거절) 또는 목록에서 사라짐 (gone_after 폴링 연속 미검출)
+  이전 상태를 벗어나는 이벤트에는 dwell (그 상태에 머문 초) 포함 → order_stats.py
+- 소비자는 마지막으로 받은 seq 이후 이벤트만 가져가면 됨
+
+Gist:
+  order_status.json  {"count", "time", "source", "seq", "orders": [...]}   ← 기존 필드 유지
+  order_events.json  {"seq", "first_seq", "events": [...]}                ← 새 이벤트 있을 때만 갱신
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+
+# (정규 상태, OCR 변형) — 긴 단어 먼저 (조리완료 ⊃ 완료, 배달중 ⊃ 배달, 조리대기 ⊃ 대기)
+STATUS_VARIANTS = [
+    ("결제취소", ["결제취소"]),
+    ("조리완료", ["조리완료", "초리완료", "조리완르"]),
+    ("조리시작", ["조리시작", "초리시작", "조리시직"]),
+    ("조리대기", ["조리대기", "초리대기"]),
+    ("처리중", ["처리중", "저리중", "처리종", "저디중"]),
+    ("배달중", ["배달중", "배닫중", "베달중"]),
+    ("배차", ["배차", "배처"]),
+    ("픽업", ["픽업", "픽엄"]),
+    ("완료", ["완료", "완르"]),
+    ("거절", ["거절"]),
+    ("취소", ["취소"]),
+    ("대기", ["대기", "데기"]),
+    ("로봇", ["로봇"]),
+    ("예약", ["예약"]),
+]
+TERMINAL = {"완료", "거절", "취소", "결제취소"}
+
+# 주문번호: 행 안의 독립된 4자리 숫자 (날짜 26.02.17 / 시각 11:25 / 금액 21,000 제외)
+_ORDER_NO_RE = re.compile(r"(?<![\d.,:])(\d{4})(?![\d.,:])")
+# 주문타입: 배달(OCR 변형 포함, 배달중 제외) / 포장 / 내점 / 홀
+_TYPE_RE = re.compile(r"(배달|배닫|베달)(?!중)|포장|내점|홀")
+
+
+def parse_row(text):
+    """행 텍스트 → {"no", "type", "status"} (주문번호 없으면 None)"""
+    m = _ORDER_NO_RE.search(text)
+    if not m:
+        return None
+    rest = text[m.end():]
+    t = _TYPE_RE.search(rest)
+    order_type = None
+    if t:
+        order_type = "배달" if t.group(1) else t.group(0)
+        rest = rest[:t.start()] + rest[t.end():]
+    status = None
+    for canon, variants in STATUS_VARIANTS:
+        if any(v in rest for v in variants):
+            status = canon
+            break
+    return {"no": m.group(1), "type": order_type, "status": status}
+
+
+class OrderTracker:
+    """폴링별 주문 행 → 주문 상태 + 이벤트 로그"""
+
+    def __init__(self, state_file=None, max_events=200, gone_after=2):
+        self.state_file = state_file
+        self.gone_after = gone_after
+        self.seq = 0
+        self.day = time.strftime("%Y%m%d")
+        self.orders = {}  # id → {"id", "no", "type", "status", "since", "missing"}
+        self.events = deque(maxlen=max_events)
+        self._load()
+
+    def update(self, rows, now=None):
+        """분류된 행 [(kind, text)] 반영 → 새 이벤트 목록
+
+        kind 가 None/header 인 행은 무시. 주문번호를 못 읽은 행은 추적 불가 (건수에는 이미 반영됨)
+        """
+        now = now or time.time()
+        day = time.strftime("%Y%m%d", time.localtime(now))
+        # 주문번호는 매일 0001부터 → 새로 보이는 번호만 오늘 날짜 ID.
+        # 자정을 넘겨 목록에 남은 주문은 원래 ID 유지 (사라지면 평소처럼 completed)
+        self.day = day
+        known = {o["no"]: oid for oid, o in self.orders.items()}
+
+        seen = {}
+        for kind, text in rows:
+            if kind in (None, "header"):
+                continue
+            row = parse_row(text)
+            if row:
+                seen[known.get(row["no"], f"{day}-{row['no']}")] = row
+
+        new_events = []
+        for oid, row in seen.items():
+            order = self.orders.get(oid)
+            status = row["status"]
+            if order is None:
+                self.orders[oid] = {"id": oid, "no": row["no"], "type": row["type"],
+                                    "status": status, "since": now, "missing": 0}
+                new_events.append(self._event(now, "created", oid, status))
+                if status in TERMINAL:
+                    new_events.append(self._event(now, "completed", oid, status))
+                continue
+            order["missing"] = 0
+            if row["type"] and not order["type"]:
+                order["type"] = row["type"]
+            # 상태를 못 읽은 행(OCR 깨짐)은 이전 상태 유지
+            if status and status != order["status"]:
+                prev = order["status"]
+                dwell = now - order["since"]
+                order["status"] = status
+                order["since"] = now
+                kind = "completed" if status in TERMINAL else "advanced"
+                new_events.append(self._event(now, kind, oid, status, prev, dwell=dwell))
+
+        for oid in list(self.orders):
+            if oid in seen:
+                continue
+            order = self.orders[oid]
+            order["missing"] += 1
+            if order["missing"] >= self.gone_after:
+                del self.orders[oid]
+                if order["status"] not in TERMINAL:
+                    new_events.append(self._event(now, "completed", oid, order["status"], reason="gone",
+                                                  dwell=now - order["since"]))
+
+        if new_events:
+            self._save()
+        return new_events
+
+    def _event(self, now, kind, oid, status, prev=None, reason=None, dwell=None):
+        self.seq += 1
+        ev = {"seq": self.seq, "t": time.strftime("%H:%M:%S", time.localtime(now)),
+              "ev": kind, "id": oid, "status": status}
+        if prev:
+            ev["prev"] = prev
+        if reason:
+            ev["reason"] = reason
+        if dwell is not None:
+            ev["dwell"] = int(dwell)
+        self.events.append(ev)
+        return ev
+
+    def snapshot(self):
+        """현재 목록에 있는 주문 (order_status.json 용)"""
+        orders = sorted(self.orders.values(), key=lambda o: o["no"])
+        return {
+            "seq": self.seq,
+            "orders": [
+                {"id": o["id"], "type": o["type"], "status": o["status"],
+                 "since": time.strftime("%H:%M:%S", time.localtime(o["since"]))}
+                for o in orders
+            ],
+        }
+
+    def events_since(self, seq):
+        """seq 이후 이벤트. 보관 범위를 벗어났으면 None (→ 스냅샷부터 다시)"""
+        if self.events and seq < self.events[0]["seq"] - 1:
+            return None
+        return [ev for ev in self.events if ev["seq"] > seq]
+
+    def delta(self, seq):
+        """seq 이후 변경분 (로컬 조회용). 보관 범위 밖이면 스냅샷 전체 (reset)"""
+        events = self.events_since(seq)
+        if events is None:
+            return {"reset": True, **self.snapshot()}
+        return {"seq": self.seq, "events": events}
+
+    def events_doc(self):
+        """order_events.json 내용"""
+        return {
+            "seq": self.seq,
+            "first_seq": self.events[0]["seq"] if self.events else self.seq + 1,
+            "events": list(self.events),
+        }
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.seq = state.get("seq", 0)
+            self.events.extend(state.get("events", []))
+            # 자정 직후 재시작해도 전날 열린 주문은 이어서 추적 (그 이전 상태는 버림)
+            yesterday = time.strftime("%Y%m%d", time.localtime(time.time() - 86400))
+            if state.get("day") in (self.day, yesterday):
+                self.orders = state.get("orders", {})
+        except Exception:
+            pass
+
+    def _save(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, "w", encoding="utf-8") as f:
+                json.dump({"seq": self.seq, "day": self.day, "orders": self.orders,
+                           "events": list(self.events)}, f, ensure_ascii=False)
+        except Exception:
+            pass
+
+
+def format_event(ev):
+    """이벤트 → 로그 한 줄"""
+    change = f"{ev['prev']}→{ev['status']}" if ev.get("prev") else f"{ev['status']}"
+    reason = f", {ev['reason']}" if ev.get("reason") else ""
+    return f"#{ev['seq']} {ev['ev']} {ev['id']} ({change}{reason})"
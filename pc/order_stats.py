@@ -0,0 +1,218 @@
+"""
+주문 흐름 통계: 폴링 건수 + 주문 이벤트를 압축 시계열로 누적 → 빠른 조회
+
+저장 (stats/, 추가 전용 고정 길이 레코드):
+  counts.bin  <IH   시각(epoch) / 건수        — 건수 변화 시 + 최대 5분마다 1건
+  events.bin  <IBBI 시각 / 이벤트 / 벗어난 상태 / 머문 초 — order_events 이벤트 1건당 1레코드
+로드 시 컬럼별 array 로 펼쳐 두고 시각 배열 이진 탐색으로 구간만 훑음
+→ 로그 재분석 없이 "최근 7일 처리중 평균 체류" 등을 ms 단위로 응답
+
+사용법:
+  python order_stats.py summary --days 7
+  python order_stats.py dwell 처리중 --days 7
+  python order_stats.py throughput --hours 1
+  python order_stats.py load --days 28
+"""
+
+import argparse
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATS_DIR = os.path.join(SCRIPT_DIR, "stats")
+
+_COUNT_REC = struct.Struct("<IH")
+_EVENT_REC = struct.Struct("<IBBI")
+# 파일에 코드로 저장되므로 순서 변경 금지 (새 값은 끝에 추가)
+EVENT_KINDS = ["created", "advanced", "completed"]
+# order_events.STATUS_VARIANTS 는 매칭 순서(긴 단어 먼저)라 바뀔 수 있음 → 코드 표는 따로 고정
+STATUS_NAMES = [
+    None,
+    "결제취소", "조리완료", "조리시작", "조리대기", "처리중", "배달중", "배차",
+    "픽업", "완료", "거절", "취소", "대기", "로봇", "예약",
+]
+# 건수가 안 바뀌어도 이 간격마다 기록 (부하 곡선 시간 가중치 상한)
+COUNT_HEARTBEAT_SEC = 300
+
+
+class OrderStats:
+    """추가 전용 시계열 + 구간 조회"""
+
+    def __init__(self, data_dir=STATS_DIR):
+        self.data_dir = data_dir
+        self.count_t = array("I")
+        self.count_v = array("H")
+        self.ev_t = array("I")
+        self.ev_kind = array("B")
+        self.ev_status = array("B")
+        self.ev_dwell = array("I")
+        self._load()
+
+    # ---- 기록 ----
+
+    def record_count(self, count, now=None):
+        now = int(now or time.time())
+        if self.count_t:
+            unchanged = self.count_v[-1] == count
+            if unchanged and now - self.count_t[-1] < COUNT_HEARTBEAT_SEC:
+                return
+            if now < self.count_t[-1]:
+                return  # 시계 역행 → 정렬 유지 위해 버림
+        self.count_t.append(now)
+        self.count_v.append(min(count, 0xFFFF))
+        self._append("counts.bin", _COUNT_REC.pack(now, min(count, 0xFFFF)))
+
+    def record_events(self, events, now=None):
+        now = int(now or time.time())
+        if not events or (self.ev_t and now < self.ev_t[-1]):
+            return
+        buf = bytearray()
+        for ev in events:
+            kind = EVENT_KINDS.index(ev["ev"])
+            # 벗어난 상태: advanced/completed 는 prev, 목록에서 사라진 경우는 마지막 상태
+            left = ev.get("prev") if "prev" in ev else (ev["status"] if ev.get("reason") == "gone" else None)
+            status = STATUS_NAMES.index(left) if left in STATUS_NAMES else 0
+            dwell = max(0, int(ev.get("dwell", 0)))
+            self.ev_t.append(now)
+            self.ev_kind.append(kind)
+            self.ev_status.append(status)
+            self.ev_dwell.append(dwell)
+            buf += _EVENT_REC.pack(now, kind, status, dwell)
+        self._append("events.bin", bytes(buf))
+
+    def _append(self, name, data):
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(os.path.join(self.data_dir, name), "ab") as f:
+                f.write(data)
+        except OSError:
+            pass
+
+    def _load(self):
+        for name, rec, cols in [
+            ("counts.bin", _COUNT_REC, (self.count_t, self.count_v)),
+            ("events.bin", _EVENT_REC, (self.ev_t, self.ev_kind, self.ev_status, self.ev_dwell)),
+        ]:
+            path = os.path.join(self.data_dir, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % rec.size  # 기록 중 끊긴 마지막 레코드 무시
+            for values in rec.iter_unpack(data[:usable]):
+                for col, v in zip(cols, values):
+                    col.append(v)
+
+    # ---- 조회 ----
+
+    @staticmethod
+    def _since(times, seconds, now):
+        return bisect_left(times, int(now - seconds))
+
+    def avg_dwell(self, status, days=7, now=None):
+        """status 상태에 머문 평균 초 → (평균 또는 None, 표본 수)"""
+        now = now or time.time()
+        code = STATUS_NAMES.index(status)
+        start = self._since(self.ev_t, days * 86400, now)
+        total = n = 0
+        for i in range(start, len(self.ev_t)):
+            if self.ev_status[i] == code and self.ev_kind[i] != 0:
+                total += self.ev_dwell[i]
+                n += 1
+        return (total / n if n else None), n
+
+    def throughput(self, hours=1, now=None, kind="completed"):
+        """최근 hours 시간 동안 시간당 이벤트 수 (기본: 완료 주문)"""
+        now = now or time.time()
+        code = EVENT_KINDS.index(kind)
+        start = self._since(self.ev_t, hours * 3600, now)
+        n = sum(1 for i in range(start, len(self.ev_t)) if self.ev_kind[i] == code)
+        return n / hours
+
+    def load_curve(self, days=28, now=None):
+        """시간대(0~23시)별 평균 처리중 건수 (시간 가중). 데이터 없는 시간대는 None"""
+        now = now or time.time()
+        start = self._since(self.count_t, days * 86400, now)
+        weighted = [0.0] * 24
+        seconds = [0] * 24
+        # 시간대 계산은 현재 UTC 오프셋 고정 (KST는 서머타임 없음, localtime 호출 생략)
+        offset = time.localtime(now).tm_gmtoff
+        for i in range(start, len(self.count_t)):
+            t = self.count_t[i]
+            end = self.count_t[i + 1] if i + 1 < len(self.count_t) else int(now)
+            # 모니터가 꺼져 있던 구간은 하트비트 간격까지만 인정
+            dur = min(end - t, COUNT_HEARTBEAT_SEC)
+            if dur <= 0:
+                continue
+            hour = (t + offset) // 3600 % 24
+            weighted[hour] += self.count_v[i] * dur
+            seconds[hour] += dur
+        return [round(weighted[h] / seconds[h], 2) if seconds[h] else None for h in range(24)]
+
+    def summary(self, days=7, now=None):
+        now = now or time.time()
+        dwell = {}
+        for status in STATUS_NAMES[1:]:
+            avg, n = self.avg_dwell(status, days, now)
+            if n:
+                dwell[status] = {"avg_sec": round(avg), "n": n}
+        return {
+            "days": days,
+            "throughput_1h": self.throughput(1, now),
+            "throughput_day": round(self.throughput(24, now) * 24),
+            "created_day": round(self.throughput(24, now, "created") * 24),
+            "dwell": dwell,
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="주문 흐름 통계 조회")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("summary")
+    p.add_argument("--days", type=int, default=7)
+    p = sub.add_parser("dwell")
+    p.add_argument("status", choices=STATUS_NAMES[1:])
+    p.add_argument("--days", type=int, default=7)
+    p = sub.add_parser("throughput")
+    p.add_argument("--hours", type=float, default=1)
+    p = sub.add_parser("load")
+    p.add_argument("--days", type=int, default=28)
+    ap.add_argument("--dir", default=STATS_DIR)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    stats = OrderStats(args.dir)
+    t1 = time.perf_counter()
+
+    if args.cmd == "summary":
+        s = stats.summary(args.days)
+        print(f"최근 {args.days}일")
+        print(f"  완료: 최근 1시간 {s['throughput_1h']:.0f}건, 최근 24시간 {s['throughput_day']}건 (신규 {s['created_day']}건)")
+        for status, d in s["dwell"].items():
+            print(f"  {status:<6} 평균 체류 {d['avg_sec'] / 60:6.1f}분  (n={d['n']})")
+    elif args.cmd == "dwell":
+        avg, n = stats.avg_dwell(args.status, args.days)
+        if avg is None:
+            print(f"최근 {args.days}일 '{args.status}' 기록 없음")
+        else:
+            print(f"최근 {args.days}일 '{args.status}' 평균 체류: {avg / 60:.1f}분 (n={n})")
+    elif args.cmd == "throughput":
+        print(f"최근 {args.hours:g}시간 완료: 시간당 {stats.throughput(args.hours):.1f}건")
+    elif args.cmd == "load":
+        curve = stats.load_curve(args.days)
+        peak = max((v for v in curve if v is not None), default=0) or 1
+        for hour, v in enumerate(curve):
+            if v is None:
+                continue
+            print(f"  {hour:02d}시 {v:5.2f}건 {'#' * round(v / peak * 40)}")
+
+    t2 = time.perf_counter()
+    print(f"(로드 {(t1 - t0) * 1000:.1f} ms, 조회 {(t2 - t1) * 1000:.1f} ms, "
+          f"레코드 {len(stats.count_t)}+{len(stats.ev_t)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+POS 창 UI 구조 스캔 (비대화식) → JSON 스냅샷 / 스냅샷 비교
+
+기존 scan_pos.py / scan_detail.py / scan_ocr_test.py 통합.
+트리를 한 번만 순회해서 요소마다 auto_id / type / text / rect(창 기준) / parent 기록.
+
+사용법:
+  python pos_scan.py snapshot -o before.json                 # 현재 화면
+  python pos_scan.py snapshot -o deliv.json --click 198354   # 배달 탭 클릭 후
+  python pos_scan.py snapshot -o s.json --capture s.png --ocr 264920,133094,198666
+  python pos_scan.py diff before.json after.json             # POS 업데이트 후 레이아웃 변화
+  python pos_scan.py layout s.json                            # 탭/목록 위치 → layout_cache.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from layout_cache import LAYOUT_FILE, load_layout, save_layout
+from mate_monitor import connect_pos, dismiss_popup
+from monitor_config import load_config
+from ocr_pipeline import set_tesseract_path
+
+
+def _config():
+    """검증된 설정 (config.json + 환경변수). 첫 실행 안내(input) 없이 읽기만"""
+    cfg, warnings = load_config()
+    for w in warnings:
+        print(f"[!] {w}")
+    return cfg
+
+
+def _info_fields(info):
+    """element_info → (auto_id, type, text, 화면 rect). uia / win32 백엔드 공통"""
+    auto_id = getattr(info, "automation_id", "") or str(getattr(info, "control_id", "") or "")
+    ctrl_type = getattr(info, "control_type", "") or getattr(info, "class_name", "")
+    try:
+        text = info.name or ""
+    except Exception:
+        text = ""
+    r = info.rectangle
+    return auto_id, ctrl_type, text, (r.left, r.top, r.right - r.left, r.bottom - r.top)
+
+
+def walk(win):
+    """창 트리 1회 순회 → 노드 목록 (parent 는 노드 인덱스, 루트는 -1)"""
+    root = win.element_info
+    ox, oy = root.rectangle.left, root.rectangle.top
+    nodes = []
+    stack = [(root, -1, "")]
+    while stack:
+        info, parent, path = stack.pop()
+        try:
+            auto_id, ctrl_type, text, (x, y, w, h) = _info_fields(info)
+            children = info.children()
+        except Exception:
+            continue
+        idx = len(nodes)
+        nodes.append({
+            "i": idx, "parent": parent, "path": path,
+            "auto_id": auto_id, "type": ctrl_type, "text": text,
+            "rect": [x - ox, y - oy, w, h],
+        })
+        for k in range(len(children) - 1, -1, -1):
+            stack.append((children[k], idx, f"{path}/{k}"))
+    return nodes
+
+
+def _ocr_nodes(snapshot, img, ids):
+    """지정 auto_id 요소 영역만 OCR → 노드 "ocr" 필드"""
+    import pytesseract
+
+    set_tesseract_path(_config())
+    for node in snapshot["nodes"]:
+        if node["auto_id"] in ids:
+            x, y, w, h = node["rect"]
+            crop = img.crop((x, y, x + w, y + h))
+            node["ocr"] = pytesseract.image_to_string(crop, lang="kor+eng", config="--psm 6").strip()
+
+
+def cmd_snapshot(args):
+    cfg = _config()
+    dismiss_popup()
+    _, win = connect_pos(cfg, load_layout())
+    if not win:
+        print("[!] POS 창 없음")
+        return 1
+
+    if args.click:
+        try:
+            tab = win.child_window(auto_id=args.click)
+            tab.click_input()
+            time.sleep(args.wait)
+        except Exception as e:
+            print(f"[!] 클릭 실패 ({args.click}): {e}")
+
+    t = time.perf_counter()
+    nodes = walk(win)
+    walk_ms = (time.perf_counter() - t) * 1000
+    r = win.rectangle()
+    snapshot = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "window": {"title": win.window_text(), "rect": [r.left, r.top, r.width(), r.height()]},
+        "walk_ms": round(walk_ms, 1),
+        "nodes": nodes,
+    }
+
+    if args.capture or args.ocr:
+        from mate_monitor import capture_window_bg
+        img = capture_window_bg(win.handle)
+        if args.capture:
+            img.save(args.capture)
+        if args.ocr:
+            _ocr_nodes(snapshot, img, set(args.ocr.split(",")))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    print(f"[OK] 요소 {len(nodes)}개 ({walk_ms:.0f} ms) → {args.output}")
+    return 0
+
+
+def _keyed(nodes):
+    """비교 키: 유일한 auto_id 우선, 없으면 type + 트리 경로"""
+    counts = {}
+    for n in nodes:
+        if n["auto_id"]:
+            counts[n["auto_id"]] = counts.get(n["auto_id"], 0) + 1
+    out = {}
+    for n in nodes:
+        key = f"id:{n['auto_id']}" if n["auto_id"] and counts[n["auto_id"]] == 1 else f"{n['type']}@{n['path']}"
+        out[key] = n
+    return out
+
+
+def diff_snapshots(a, b):
+    """두 스냅샷 → {"added", "removed", "moved", "text"} (키 목록 / 변화)"""
+    ka, kb = _keyed(a["nodes"]), _keyed(b["nodes"])
+    result = {
+        "added": sorted(kb.keys() - ka.keys()),
+        "removed": sorted(ka.keys() - kb.keys()),
+        "moved": [],
+        "text": [],
+    }
+    for key in sorted(ka.keys() & kb.keys()):
+        na, nb = ka[key], kb[key]
+        if na["rect"] != nb["rect"]:
+            result["moved"].append((key, na["rect"], nb["rect"]))
+        if na["text"] != nb["text"]:
+            result["text"].append((key, na["text"], nb["text"]))
+    return result
+
+
+def _label(node):
+    text = node["text"].replace("\n", " ")[:30]
+    return f"{node['type']} \"{text}\" {node['rect']}"
+
+
+def cmd_diff(args):
+    with open(args.a, "r", encoding="utf-8") as f:
+        a = json.load(f)
+    with open(args.b, "r", encoding="utf-8") as f:
+        b = json.load(f)
+    t = time.perf_counter()
+    d = diff_snapshots(a, b)
+    ms = (time.perf_counter() - t) * 1000
+    ka, kb = _keyed(a["nodes"]), _keyed(b["nodes"])
+
+    for key in d["added"]:
+        print(f"  + {key}  {_label(kb[key])}")
+    for key in d["removed"]:
+        print(f"  - {key}  {_label(ka[key])}")
+    for key, ra, rb in d["moved"]:
+        print(f"  ~ {key}  {ra} → {rb}")
+    for key, ta, tb in d["text"]:
+        print(f"  T {key}  \"{ta}\" → \"{tb}\"")
+    print(f"추가 {len(d['added'])} / 삭제 {len(d['removed'])} / 이동 {len(d['moved'])} / "
+          f"텍스트 {len(d['text'])}  ({ms:.1f} ms)")
+    return 1 if any(d.values()) else 0
+
+
+def cmd_layout(args):
+    """스냅샷의 탭/목록 위치 → 모니터 layout_cache.json "rois" (창 기준 [x, y, w, h])"""
+    with open(args.snapshot, "r", encoding="utf-8") as f:
+        snap = json.load(f)
+    cfg = _config()
+    wanted = {
+        "delivery_tab": cfg["delivery_tab_id"],
+        "processing_tab": cfg["processing_tab_id"],
+        "list": cfg["list_pane_id"],
+    }
+    by_id = {n["auto_id"]: n for n in snap["nodes"] if n["auto_id"]}
+    rois = {name: by_id[aid]["rect"] for name, aid in wanted.items() if aid in by_id}
+    missing = [name for name in wanted if name not in rois]
+
+    layout = load_layout()
+    # 스냅샷에 없는 요소(예: 탭 클릭 전 목록)는 저장된 위치 유지 → rois.list 가 지워지지 않도록
+    layout.setdefault("rois", {}).update(rois)
+    layout["window_size"] = snap["window"]["rect"][2:]
+    save_layout(layout)
+    for name, rect in rois.items():
+        print(f"  {name}: {rect}")
+    if missing:
+        print(f"[!] 스냅샷에 없음: {', '.join(missing)} (해당 탭 클릭 후 다시 snapshot)")
+        for name in missing:
+            if name in layout["rois"]:
+                print(f"    {name}: 기존 위치 유지 {layout['rois'][name]}")
+    print(f"[OK] → {LAYOUT_FILE}")
+    return 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="POS 창 UI 구조 스캔 / 비교")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("snapshot", help="트리 1회 순회 → JSON")
+    p.add_argument("-o", "--output", default=f"scan_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    p.add_argument("--click", help="스냅샷 전에 클릭할 auto_id (예: 배달 탭 198354)")
+    p.add_argument("--wait", type=float, default=1.5, help="클릭 후 대기 초")
+    p.add_argument("--capture", help="창 캡처 PNG 저장 경로")
+    p.add_argument("--ocr", help="영역 OCR 할 auto_id 목록 (쉼표 구분)")
+    p = sub.add_parser("diff", help="두 스냅샷 비교 (변화 있으면 종료코드 1)")
+    p.add_argument("a")
+    p.add_argument("b")
+    p = sub.add_parser("layout", help="스냅샷 → 모니터 레이아웃 캐시")
+    p.add_argument("snapshot")
+    args = ap.parse_args()
+
+    handler = {"snapshot": cmd_snapshot, "diff": cmd_diff, "layout": cmd_layout}[args.cmd]
+    sys.exit(handler(args))
+
+
+if __name__ == "__main__":
+    main()
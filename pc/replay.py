@@ -0,0 +1,56 @@
+"""
+POS 캡처 기록 / 재생 (벤치마크 · 튜닝용)
+
+기록: config.json 의 "record_dir" 지정 시 매 폴링 캡처를 PNG로 저장
+  record_dir/
+    20260217_113235.png
+    index.jsonl   ← {"file", "time", "count"} 한 줄씩 (count = 감지된 건수)
+
+정답: index.jsonl 줄에 사람이 확인한 "label": <실제 건수> 추가 (감지 실패 count=null 줄 우선)
+  → "label" 만 정답. count 는 기록 당시 모니터 자신의 결과 (자기 라벨, 정답 아님)
+"""
+
+import json
+import os
+import time
+
+INDEX_NAME = "index.jsonl"
+
+
+def record_frame(record_dir, img, count):
+    """캡처 1장 + 감지 건수 기록"""
+    os.makedirs(record_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    name = f"{stamp}.png"
+    img.save(os.path.join(record_dir, name))
+    with open(os.path.join(record_dir, INDEX_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"file": name, "time": stamp, "count": count}) + "\n")
+
+
+def load_frames(record_dir, labelled_only=False):
+    """기록된 프레임 목록 → [(png 경로, 건수 또는 None, 정답 여부)] (시간순)
+
+    정답 여부: "label" 이 있으면 True (건수 = label), 없으면 False (건수 = 감지 count)
+    labelled_only: label 있는 프레임만 (감지 실패 프레임도 label 있으면 포함)
+    """
+    index = os.path.join(record_dir, INDEX_NAME)
+    frames = []
+    if not os.path.exists(index):
+        # index 없이 PNG만 있는 폴더도 재생 가능 (정답 없음)
+        for name in sorted(os.listdir(record_dir)):
+            if name.lower().endswith(".png") and not labelled_only:
+                frames.append((os.path.join(record_dir, name), None, False))
+        return frames
+    with open(index, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            explicit = "label" in entry
+            if labelled_only and not explicit:
+                continue
+            path = os.path.join(record_dir, entry["file"])
+            if os.path.exists(path):
+                frames.append((path, entry["label"] if explicit else entry.get("count"), explicit))
+    return frames
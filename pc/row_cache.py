@@ -0,0 +1,196 @@
+"""
+주문 목록 행 단위 OCR 캐시
+
+행 전체는 폴링마다 바뀜 (경과 시간 열 7분 → 8분, 목록 밖 상단 시계)
+→ 주문 목록 영역(layout rois.list) 안에서만 행을 나누고,
+  행마다 주문번호 / 주문타입 / 주문상태 열만 남긴 이미지(나머지 열은 흰색)를 키로 사용
+→ 이 세 열은 상태가 바뀌기 전까지 픽셀 단위로 동일 → 분류 결과를 LRU 캐시
+→ 바뀐 행만 (같은 열 마스크 이미지로) 모아서 Tesseract 1회 호출
+
+해시는 정확 일치(blake2b)를 사용. 처리중 → 조리시작처럼 상태 글자 몇 개만
+바뀌는 경우 지각 해시(dHash 등)는 충돌 가능성이 있어 쓰지 않음.
+"""
+
+import hashlib
+import sys
+from collections import OrderedDict
+
+# 행 사이 여백이 이 값(px) 이하이면 같은 행으로 합침 (날짜 2줄 셀 등)
+ROW_MERGE_GAP = 4
+ROW_MIN_HEIGHT = 8
+# 미스 행을 세로로 이어 붙일 때 행 사이 여백
+STACK_PAD = 16
+# 키 / OCR 에 쓰는 열: 목록 영역 폭 대비 (시작, 끝) 비율. 경과 시간 · 금액 · 주소 열은 제외
+KEY_COLUMNS = {
+    "no": (0.0, 0.114),
+    "type": (0.229, 0.357),
+    "status": (0.861, 1.0),
+}
+
+
+class RowOcrCache:
+    """행 해시 → (kind, text) LRU 캐시. 항목 수 + 메모리 상한"""
+
+    def __init__(self, max_entries=512, max_bytes=2 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key → (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key, value):
+        size = sys.getsizeof(key) + sum(sys.getsizeof(v) for v in value)
+        old = self._data.pop(key, None)
+        if old:
+            self.bytes -= old[1]
+        self._data[key] = (value, size)
+        self.bytes += size
+        while self._data and (len(self._data) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def split_rows(bw):
+    """이진 이미지 → 텍스트 행 띠 [(top, bottom)]
+
+    가로 방향 명암 변화량의 행별 평균(수평 투영)으로 판단.
+    단색 영역(상단 바, 빈 목록, 배경)은 변화량 0 → 행 구분선 역할.
+    """
+    from PIL import Image, ImageChops
+
+    gray = bw.convert("L")
+    w, h = gray.size
+    edges = ImageChops.difference(gray, ImageChops.offset(gray, 1, 0))
+    profile = edges.resize((1, h), Image.BOX).tobytes()
+
+    bands = []
+    start = None
+    last_ink = -ROW_MERGE_GAP - 1
+    for y, v in enumerate(profile):
+        if v == 0:
+            continue
+        if start is None:
+            start = y
+        elif y - last_ink > ROW_MERGE_GAP + 1:
+            bands.append((start, last_ink + 1))
+            start = y
+        last_ink = y
+    if start is not None:
+        bands.append((start, last_ink + 1))
+    return [(t, b) for t, b in bands if b - t >= ROW_MIN_HEIGHT]
+
+
+def key_columns(roi):
+    """목록 영역 (x0, y0, x1, y1) → 키 열 x 구간 [(x0, x1)] (이미지 좌표)"""
+    x0, _, x1, _ = roi
+    w = x1 - x0
+    return [(x0 + round(a * w), x0 + round(b * w)) for a, b in KEY_COLUMNS.values()]
+
+
+def row_image(bw, band, columns):
+    """행 띠 → 키 열만 남긴 행 이미지 (목록 폭, 나머지는 흰색)"""
+    from PIL import Image
+
+    left = columns[0][0]
+    img = Image.new("1", (columns[-1][1] - left, band[1] - band[0]), 1)
+    for x0, x1 in columns:
+        img.paste(bw.crop((x0, band[0], x1, band[1])), (x0 - left, 0))
+    return img
+
+
+def row_key(img):
+    """행 이미지 정확 해시 (크기 포함)"""
+    digest = hashlib.blake2b(img.tobytes(), digest_size=16)
+    digest.update(f"{img.size[0]}x{img.size[1]}".encode())
+    return digest.hexdigest()
+
+
+def ocr_stacked(images, lang="kor+eng", config="--psm 6"):
+    """여러 행 이미지를 세로로 이어 붙여 Tesseract 1회 호출 → 행별 텍스트 목록"""
+    import pytesseract
+    from PIL import Image
+
+    w = max(img.size[0] for img in images)
+    heights = [img.size[1] for img in images]
+    canvas = Image.new("1", (w, sum(heights) + STACK_PAD * (len(images) + 1)), 1)
+    offsets = []
+    y = STACK_PAD
+    for img, hgt in zip(images, heights):
+        canvas.paste(img, (0, y))
+        offsets.append((y, y + hgt))
+        y += hgt + STACK_PAD
+
+    data = pytesseract.image_to_data(canvas, lang=lang, config=config,
+                                     output_type=pytesseract.Output.DICT)
+    words = [[] for _ in images]
+    for text, left, top, hgt in zip(data["text"], data["left"], data["top"], data["height"]):
+        text = text.strip()
+        if not text:
+            continue
+        cy = top + hgt / 2
+        for i, (y0, y1) in enumerate(offsets):
+            if y0 - STACK_PAD / 2 <= cy < y1 + STACK_PAD / 2:
+                words[i].append((left, text))
+                break
+    return [" ".join(t for _, t in sorted(ws)) for ws in words]
+
+
+def read_rows(bw, roi, cache, classify, matcher=None, scale=None, psm=6, x_offset=0):
+    """이진 이미지의 목록 영역 → [(kind, text)] (캐시 미스 행만 인식)
+
+    roi: 목록 영역 (x0, y0, x1, y1), bw 좌표. 이 안에서만 행을 나눔
+    cache: RowOcrCache (None 이면 캐시 없이 템플릿 → OCR 만)
+    classify: 텍스트 한 줄 → 분류 (None / header / active / excluded / guess)
+    matcher: StatusMatcher (있으면 미스 행을 템플릿으로 먼저 인식, 못 읽은 행만 OCR)
+    x_offset: bw 왼쪽 끝의 전체 창 기준 x (목록만 잘라 전처리한 경우, 템플릿 열 위치 보정)
+    반환: (행 목록, Tesseract 로 OCR 한 행 수)
+    """
+    top = roi[1]
+    bands = [(top + t, top + b) for t, b in split_rows(bw.crop(roi))]
+    columns = key_columns(roi)
+    images = [row_image(bw, band, columns) for band in bands]
+    if cache is not None:
+        keys = [row_key(img) for img in images]
+        rows = [cache.get(k) for k in keys]
+    else:
+        rows = [None] * len(images)
+
+    missing = [i for i, r in enumerate(rows) if r is None]
+    if missing and matcher is not None:
+        texts = matcher.recognize(bw, [bands[i] for i in missing], scale, x_offset)
+        for i, text in zip(missing, texts):
+            if text is not None:
+                rows[i] = (classify(text), text)
+                if cache is not None:
+                    cache.put(keys[i], rows[i])
+        missing = [i for i in missing if rows[i] is None]
+    if missing:
+        texts = ocr_stacked([images[i] for i in missing], config=f"--psm {psm}")
+        for i, text in zip(missing, texts):
+            rows[i] = (classify(text), text)
+            if cache is not None:
+                cache.put(keys[i], rows[i])
+    return rows, len(missing)
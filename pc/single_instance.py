@@ -0,0 +1,204 @@
+"""
+모니터 단일 인스턴스 보장 + 로컬 상태 조회
+
+- monitor.lock 에 OS 파일 락 (Windows: msvcrt, 그 외: fcntl)
+  → 프로세스가 죽으면 OS가 락 해제, PID 파일 경쟁/오탐 없음
+- 락 보유 인스턴스는 127.0.0.1 임시 포트로 상태 서버를 열고
+  포트 번호를 락 파일에 기록
+- 두 번째 실행은 기존 모니터를 죽이지 않고 상태만 조회 후 종료
+
+요청 (한 줄 텍스트 → JSON 한 줄 응답):
+  status         현재 상태
+  events <seq>   seq 이후 주문 이벤트 (register 로 등록된 핸들러)
+  stats <days>   최근 days일 주문 흐름 요약 (order_stats.py)
+
+사용법:
+  python mate_monitor.py --status
+  python mate_monitor.py --events 120
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+# Windows 바이트 범위 락은 다른 프로세스의 읽기도 막으므로
+# 내용(JSON)과 겹치지 않는 위치를 잠근다 (EOF 너머 락 허용됨)
+_LOCK_OFFSET = 4096
+
+
+class SingleInstance:
+    """락 파일 기반 단일 인스턴스"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+        self._info = {}
+
+    def acquire(self, wait_sec=0):
+        """락 획득 시도. wait_sec 동안 재시도 (재시작 직후 이전 프로세스 종료 대기용)"""
+        deadline = time.monotonic() + wait_sec
+        while True:
+            if self._try_lock():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+    def _try_lock(self):
+        # "a+": 락 못 잡은 쪽이 기존 내용을 지우지 않도록
+        fh = open(self.path, "a+", encoding="utf-8")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                fh.seek(_LOCK_OFFSET)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._fh = fh
+        self.publish(**self._info)
+        return True
+
+    def publish(self, **info):
+        """락 파일에 PID(+포트 등) 기록. 다시 획득하면 마지막 info 로 재기록"""
+        self._info = info
+        if not self._fh:
+            return
+        data = {"pid": os.getpid(), **info}
+        self._fh.seek(0)
+        self._fh.truncate()
+        self._fh.write(json.dumps(data))
+        self._fh.flush()
+
+    def release(self):
+        if not self._fh:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._fh.seek(_LOCK_OFFSET)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        self._fh.close()
+        self._fh = None
+
+
+class StatusServer:
+    """127.0.0.1 상태 서버. 요청 'status' → JSON 한 줄 응답"""
+
+    def __init__(self):
+        self._status = {"pid": os.getpid(), "started": time.strftime("%Y-%m-%d %H:%M:%S")}
+        self._lock = threading.Lock()
+        self._handlers = {}
+        self._sock = None
+        self.port = None
+
+    def register(self, name, handler):
+        """요청 '<name> <인자>' → handler(인자) 반환값을 JSON 응답 (상태 lock 안에서 호출)"""
+        self._handlers[name] = handler
+
+    def update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    @property
+    def lock(self):
+        """register 핸들러가 읽는 데이터를 메인 스레드에서 바꿀 때 잡는 락"""
+        return self._lock
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._status, ensure_ascii=False))
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(4)
+        self._sock = sock
+        self.port = sock.getsockname()[1]
+        threading.Thread(target=self._serve, name="status-server", daemon=True).start()
+        return self.port
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return  # 소켓 닫힘
+            with conn:
+                try:
+                    conn.settimeout(2)
+                    req = conn.recv(256).decode("utf-8", "replace").strip()
+                    name, _, arg = req.partition(" ")
+                    if name == "status":
+                        body = self.snapshot()
+                    elif name in self._handlers:
+                        try:
+                            with self._lock:
+                                body = json.loads(json.dumps(self._handlers[name](arg), ensure_ascii=False))
+                        except Exception as e:
+                            body = {"error": f"{name}: {e}"}
+                    else:
+                        body = {"error": f"unknown request: {req}"}
+                    conn.sendall(json.dumps(body, ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError:
+                    pass
+
+    def close(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+
+def query_status(lock_path, timeout=3):
+    """실행 중인 모니터에 상태 조회 → dict (실패 시 None)"""
+    return query(lock_path, "status", timeout)
+
+
+def query(lock_path, request, timeout=3):
+    """실행 중인 모니터에 요청 1건 → 응답 (실패 시 None)"""
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f:
+            port = json.loads(f.read().strip() or "{}").get("port")
+    except (OSError, ValueError):
+        return None
+    if not port:
+        return None
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout) as conn:
+            conn.sendall(request.encode("utf-8") + b"\n")
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        return json.loads(buf.decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def format_status(status):
+    """상태 dict → 출력용 줄 목록"""
+    if not status:
+        return ["[!] 실행 중인 모니터가 응답하지 않습니다."]
+    lines = [f"=== 실행 중인 모니터 (PID {status.get('pid')}, 시작 {status.get('started')}) ==="]
+    for k, v in status.items():
+        if k in ("pid", "started") or isinstance(v, dict):
+            continue
+        lines.append(f"  {k}: {v}")
+    for k, v in status.items():
+        if isinstance(v, dict):
+            lines.append(f"  [{k}]")
+            for name, val in v.items():
+                lines.append(f"    {name}: {val}")
+    return lines
@@ -0,0 +1,53 @@
+"""
+모니터 시작 경로 단계별 시간 측정 (--profile-startup)
+
+사용법:
+  python mate_monitor.py --profile-startup
+  → import / 설정 / Tesseract 확인 / POS 연결 단계별 소요시간 출력 후 종료
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+
+# 시작 시 지연 로딩되는 무거운 모듈 (측정 대상)
+HEAVY_MODULES = ["requests", "PIL.Image", "pytesseract", "pywinauto", "win32gui", "win32ui"]
+
+
+class StartupProfile:
+    """단계 이름 → 소요시간(초) 기록"""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.stages = []  # [(이름, 초, 비고)]
+
+    @contextmanager
+    def stage(self, name):
+        t = time.perf_counter()
+        note = {"text": ""}
+        try:
+            yield note
+        finally:
+            self.stages.append((name, time.perf_counter() - t, note["text"]))
+
+    def import_all(self, modules=HEAVY_MODULES):
+        """무거운 모듈을 하나씩 import 하며 시간 측정 (이후 단계는 import 비용 제외)"""
+        for name in modules:
+            with self.stage(f"import {name}") as note:
+                try:
+                    importlib.import_module(name)
+                except Exception as e:
+                    note["text"] = f"실패: {type(e).__name__}"
+
+    def as_dict(self):
+        """상태 조회용 {단계: ms}"""
+        return {name: round(sec * 1000, 1) for name, sec, _ in self.stages}
+
+    def report(self):
+        total = time.perf_counter() - self.t0
+        lines = ["=== 시작 프로파일 ==="]
+        for name, sec, note in self.stages:
+            suffix = f"  ({note})" if note else ""
+            lines.append(f"  {name:<28} {sec * 1000:8.1f} ms{suffix}")
+        lines.append(f"  {'합계':<28} {total * 1000:8.1f} ms")
+        return lines
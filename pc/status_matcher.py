@@ -0,0 +1,387 @@
+"""
+주문 행 템플릿 매칭 인식기 (Tesseract 대체, CPU / NumPy)
+
+POS 는 고정 글꼴 · 고정 열 위치로 렌더링 → 정해진 어휘만 읽으면 됨
+  주문번호  숫자 0~9 글자 템플릿
+  주문타입  배달 / 포장 / 내점 ... 단어 템플릿
+  주문상태  처리중 / 조리시작 / 완료 ... 단어 템플릿 (order_events.STATUS_VARIANTS 정규 이름)
+글자/단어 잉크 영역 → 고정 크기 정규화 → 템플릿 행렬과 정규화 상관(NCC) 한 번의 행렬곱.
+점수가 낮거나 1·2위 차이가 작으면 None → 호출측이 Tesseract 로 대체.
+
+학습 (numpy 필요):
+  1. python status_matcher.py extract <record_dir> rows/
+     → 기록된 캡처(replay.py)에서 행 잘라내기 + Tesseract 로 라벨 초안 (rows/labels.jsonl)
+     전처리는 모니터와 같은 config "ocr_scale / ocr_resample / ocr_threshold" (모델에 기록,
+     tune_ocr.py 로 바뀌면 모니터가 경고 → extract / train 다시)
+  2. rows/labels.jsonl 검토 (틀린 no / type / status 수정, 쓸모없는 줄 삭제)
+  3. python status_matcher.py train rows/ -o status_model.npz
+     → 행의 --holdout 비율(파일명 해시로 고정)은 학습에서 빼고 검증용으로 남김
+  4. python status_matcher.py bench rows/ -m status_model.npz   (검증 행 정확도 + 행당 지연)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from order_events import STATUS_VARIANTS, parse_row
+
+WORD_SIZE = (96, 24)   # (W, H) 단어 정규화 크기
+DIGIT_SIZE = (16, 24)  # 숫자 한 글자
+ROI_MARGIN = 8         # 학습 박스 합집합 좌우 여유 (px)
+MIN_SCORE = 0.80       # 이 미만이면 Tesseract 대체
+MIN_MARGIN = 0.05      # 1위와 (다른 라벨) 2위 점수 차 최소
+MAX_ASPECT_DIFF = 0.35  # 단어 가로세로비 차이 허용 (정규화로 잃는 폭 정보 보완)
+
+FIELDS = ("no", "type", "status")
+HOLDOUT = 0.2          # 학습에서 빼고 bench 로 검증할 행 비율
+_TYPE_WORDS = ["배달", "포장", "내점", "홀"]
+
+
+# ---- 공통: 잉크 영역 → 정규화 벡터 ----
+
+def _ink(img):
+    """PIL 이진/회색 → 잉크(검정) bool 배열"""
+    a = np.asarray(img.convert("L"))
+    return a < 128
+
+
+def _bbox(ink):
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(rows) or not len(cols):
+        return None
+    return rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+
+def _normalize(ink, size):
+    """잉크 bool 배열 → 잉크 박스만 잘라 size 로 맞춘 float 벡터 + 가로세로비"""
+    box = _bbox(ink)
+    if box is None:
+        return None, 0.0
+    y0, y1, x0, x1 = box
+    crop = ink[y0:y1, x0:x1]
+    aspect = crop.shape[1] / crop.shape[0]
+    im = Image.fromarray(crop.astype(np.uint8) * 255).resize(size, Image.BILINEAR)
+    return np.asarray(im, dtype=np.float32).ravel() / 255.0, aspect
+
+
+def _center(vecs):
+    """행마다 평균 0, 노름 1 (내적 = 정규화 상관)"""
+    vecs = vecs - vecs.mean(axis=1, keepdims=True)
+    norm = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs / np.maximum(norm, 1e-6)
+
+
+def _split_glyphs(ink):
+    """숫자 칸 잉크 → 세로 투영으로 글자별 열 구간"""
+    cols = ink.any(axis=0)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], cols.astype(np.int8), [0]))))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+# ---- 인식기 ----
+
+class StatusMatcher:
+    """학습된 템플릿 (.npz) 으로 행 인식"""
+
+    def __init__(self, model_path):
+        with np.load(model_path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            self.scale = meta["scale"]
+            self.holdout = meta.get("holdout", 0)  # 예전 모델: 전체 행으로 학습
+            # 예전 모델 (extract 가 lanczos / 128 고정이던 때) 은 기본값
+            self.prep = {"scale": meta["scale"], "resample": meta.get("resample", "lanczos"),
+                         "threshold": meta.get("threshold", 128)}
+            self.roi = {f: tuple(meta["roi"][f]) for f in FIELDS}
+            self.labels = {f: meta["labels"][f] for f in FIELDS}
+            self.aspect = {f: np.array(meta["aspect"][f], dtype=np.float32) for f in ("type", "status")}
+            self.templates = {f: _center(z[f"{f}_T"]) for f in FIELDS}
+        self.hits = 0
+        self.fallbacks = 0
+
+    def _match(self, field, vecs, aspects=None):
+        """vecs (n, d) → [(라벨, 점수) 또는 None]"""
+        if not len(vecs):
+            return []
+        scores = _center(np.stack(vecs)) @ self.templates[field].T  # (n, 템플릿 수)
+        if aspects is not None:
+            a = np.array(aspects, dtype=np.float32)[:, None]
+            t = self.aspect[field][None, :]
+            scores = np.where(np.abs(a - t) / t > MAX_ASPECT_DIFF, -1.0, scores)
+        labels = self.labels[field]
+        out = []
+        for row in scores:
+            order = np.argsort(row)[::-1]
+            best = order[0]
+            # 같은 라벨 템플릿이 여러 개일 수 있음 → 다른 라벨 중 최고점과 비교
+            second = next((row[j] for j in order[1:] if labels[j] != labels[best]), -1.0)
+            if row[best] >= MIN_SCORE and row[best] - second >= MIN_MARGIN:
+                out.append((labels[best], float(row[best])))
+            else:
+                out.append(None)
+        return out
+
+    def _cell(self, bw, band, field, x_offset=0):
+        x0, x1 = self.roi[field]
+        return _ink(bw.crop((x0 - x_offset, band[0], x1 - x_offset, band[1])))
+
+    def _read_number(self, ink):
+        glyphs = []
+        for c0, c1 in _split_glyphs(ink):
+            vec, _ = _normalize(ink[:, c0:c1], DIGIT_SIZE)
+            if vec is not None:
+                glyphs.append(vec)
+        if not 3 <= len(glyphs) <= 5:
+            return None
+        digits = self._match("no", glyphs)
+        if any(d is None for d in digits):
+            return None
+        return "".join(d[0] for d in digits)
+
+    def recognize(self, bw, bands, scale=None, x_offset=0):
+        """행 띠 목록 → 행마다 "주문번호 타입 상태" 텍스트 또는 None (→ Tesseract 대체)
+
+        x_offset: bw 왼쪽 끝의 전체 창 기준 x (열 위치는 전체 창 기준으로 학습됨)
+        """
+        if scale is not None and scale != self.scale:
+            return [None] * len(bands)
+        words = {"type": [], "status": []}
+        for band in bands:
+            for field in words:
+                words[field].append(_normalize(self._cell(bw, band, field, x_offset), WORD_SIZE))
+
+        matched = {}
+        for field, items in words.items():
+            idx = [i for i, (v, _) in enumerate(items) if v is not None]
+            res = self._match(field, [items[i][0] for i in idx], [items[i][1] for i in idx])
+            matched[field] = dict(zip(idx, res))
+
+        out = []
+        for i, band in enumerate(bands):
+            t = matched["type"].get(i)
+            s = matched["status"].get(i)
+            no = self._read_number(self._cell(bw, band, "no", x_offset)) if t and s else None
+            if no is None:
+                self.fallbacks += 1
+                out.append(None)
+                continue
+            self.hits += 1
+            out.append(f"{no} {t[0]} {s[0]}")
+        return out
+
+
+# ---- 학습 도구 ----
+
+def _find_boxes(data):
+    """image_to_data 단어 목록 → 필드별 (텍스트, 박스)"""
+    found = {}
+    for text, left, top, w, h in zip(data["text"], data["left"], data["top"], data["width"], data["height"]):
+        text = text.strip()
+        if not text:
+            continue
+        box = [left, top, left + w, top + h]
+        if "no" not in found and len(text) == 4 and text.isdigit():
+            found["no"] = (text, box)
+        elif "type" not in found and any(text.startswith(v) for v in _TYPE_WORDS) and "중" not in text:
+            found["type"] = (text, box)
+        elif "status" not in found:
+            for canon, variants in STATUS_VARIANTS:
+                if any(v in text for v in variants):
+                    found["status"] = (canon, box)
+                    break
+    return found
+
+
+def cmd_extract(record_dir, out_dir):
+    """기록된 캡처 → 행 crop + 라벨 초안 (모니터와 같은 전처리 / 목록 영역)"""
+    import pytesseract
+
+    from layout_cache import list_roi
+    from monitor_config import load_config
+    from ocr_pipeline import ocr_params, preprocess
+    from replay import load_frames
+    from row_cache import split_rows
+
+    params = ocr_params(load_config()[0])
+    prep = {k: params[k] for k in ("scale", "resample", "threshold")}
+    roi = list_roi()
+    os.makedirs(out_dir, exist_ok=True)
+    label_file = os.path.join(out_dir, "labels.jsonl")
+    n = len(_load_labels(out_dir)) if os.path.exists(label_file) else 0  # 이어서 추가
+    print(f"전처리: x{prep['scale']:g} {prep['resample']} thr {prep['threshold']}, "
+          f"목록 영역 {roi or '없음 (전체 창에서 행 분할)'}")
+    with open(label_file, "a", encoding="utf-8") as out:
+        for path, _, _ in load_frames(record_dir):
+            _, bw = preprocess(Image.open(path).convert("RGB"), **prep)
+            if roi:
+                # 모니터(read_rows)와 같이 목록 영역 안에서만 행 분할, crop 은 전체 폭 (열 위치 = 창 기준)
+                box = tuple(round(v * prep["scale"]) for v in (roi[0], roi[1], roi[0] + roi[2], roi[1] + roi[3]))
+                bands = [(box[1] + t, box[1] + b) for t, b in split_rows(bw.crop(box))]
+            else:
+                bands = split_rows(bw)
+            for top, bottom in bands:
+                crop = bw.crop((0, top, bw.size[0], bottom))
+                data = pytesseract.image_to_data(crop, lang="kor+eng", config="--psm 6",
+                                                 output_type=pytesseract.Output.DICT)
+                found = _find_boxes(data)
+                if len(found) < 3:
+                    continue
+                name = f"r{n:06d}.png"
+                crop.save(os.path.join(out_dir, name))
+                row = parse_row(" ".join(found[f][0] for f in FIELDS)) or {}
+                out.write(json.dumps({
+                    "file": name, **prep,
+                    "no": found["no"][0], "type": row.get("type") or found["type"][0],
+                    "status": found["status"][0],
+                    "boxes": {f: [int(v) for v in found[f][1]] for f in FIELDS},
+                }, ensure_ascii=False) + "\n")
+                n += 1
+    print(f"행 {n}개 → {label_file} 검토 후 train")
+
+
+def _load_labels(rows_dir):
+    with open(os.path.join(rows_dir, "labels.jsonl"), "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _is_holdout(entry, fraction):
+    """행 파일명 해시로 검증 행 여부 (extract 로 행을 추가해도 기존 행의 배정은 그대로)"""
+    h = int.from_bytes(hashlib.blake2b(entry["file"].encode(), digest_size=4).digest(), "big")
+    return h < fraction * 2 ** 32
+
+
+def cmd_train(rows_dir, model_path, holdout=HOLDOUT):
+    labels = _load_labels(rows_dir)
+    if not labels:
+        print("[!] 라벨 없음")
+        return
+    n_all = len(labels)
+    labels = [e for e in labels if not _is_holdout(e, holdout)]
+    if not labels:
+        print(f"[!] 학습 행 없음 (전체 {n_all}개가 검증용, --holdout 낮추기)")
+        return
+    preps = {(e["scale"], e.get("resample", "lanczos"), e.get("threshold", 128)) for e in labels}
+    if len(preps) > 1:
+        print(f"[!] 전처리가 다른 행이 섞여 있음: {sorted(preps, key=str)} (같은 설정으로 extract 다시)")
+        return
+    scale, resample, threshold = preps.pop()
+    roi = {f: [10 ** 9, 0] for f in FIELDS}
+    for e in labels:
+        for f in FIELDS:
+            roi[f][0] = min(roi[f][0], e["boxes"][f][0] - ROI_MARGIN)
+            roi[f][1] = max(roi[f][1], e["boxes"][f][2] + ROI_MARGIN)
+    roi = {f: [max(0, a), b] for f, (a, b) in roi.items()}
+
+    # 실행 시와 같은 ROI 로 잘라야 잉크 박스가 일치
+    samples = {f: {} for f in FIELDS}
+    aspects = {"type": {}, "status": {}}
+    for e in labels:
+        crop = Image.open(os.path.join(rows_dir, e["file"]))
+        for f in ("type", "status"):
+            x0, x1 = roi[f]
+            vec, aspect = _normalize(_ink(crop.crop((x0, 0, x1, crop.size[1]))), WORD_SIZE)
+            if vec is not None:
+                samples[f].setdefault(e[f], []).append(vec)
+                aspects[f].setdefault(e[f], []).append(aspect)
+        x0, x1 = roi["no"]
+        ink = _ink(crop.crop((x0, 0, x1, crop.size[1])))
+        spans = _split_glyphs(ink)
+        if len(spans) == len(e["no"]):
+            for ch, (c0, c1) in zip(e["no"], spans):
+                vec, _ = _normalize(ink[:, c0:c1], DIGIT_SIZE)
+                if vec is not None:
+                    samples["no"].setdefault(ch, []).append(vec)
+
+    empty = [f for f in FIELDS if not samples[f]]
+    if empty:
+        # 예) 주문번호 글자 수가 라벨과 안 맞거나 ROI 에 잉크 없음 → 라벨 / 박스 확인
+        print(f"[!] 학습 샘플 없는 항목: {', '.join(empty)} (labels.jsonl 의 boxes / 값 확인)")
+        return
+
+    arrays = {}
+    meta = {"scale": scale, "resample": resample, "threshold": threshold, "holdout": holdout,
+            "roi": roi, "labels": {}, "aspect": {}}
+    for f in FIELDS:
+        keys = sorted(samples[f])
+        meta["labels"][f] = keys
+        arrays[f"{f}_T"] = np.stack([np.mean(samples[f][k], axis=0) for k in keys]).astype(np.float32)
+        if f in aspects:
+            meta["aspect"][f] = [float(np.median(aspects[f][k])) for k in keys]
+        print(f"  {f}: {', '.join(f'{k}({len(samples[f][k])})' for k in keys)}")
+    np.savez_compressed(model_path, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    print(f"[OK] 모델 저장: {model_path} (학습 행 {len(labels)}개, 검증용 {n_all - len(labels)}개, ROI {roi})")
+
+
+def cmd_bench(rows_dir, model_path, with_ocr):
+    labels = _load_labels(rows_dir)
+    if not labels:
+        print("[!] 라벨 없음")
+        return
+    matcher = StatusMatcher(model_path)
+    # 학습에 쓴 행은 제외 → 처음 보는 행 기준 정확도
+    labels = [e for e in labels if _is_holdout(e, matcher.holdout)]
+    if not labels:
+        print(f"[!] 검증 행 없음 (모델 holdout {matcher.holdout:g}) → train --holdout 0.2 로 다시 학습")
+        return
+    print(f"검증 행 {len(labels)}개 (학습에 쓰지 않은 행)")
+    crops = [Image.open(os.path.join(rows_dir, e["file"])) for e in labels]
+
+    t = time.perf_counter()
+    results = [matcher.recognize(c, [(0, c.size[1])])[0] for c in crops]
+    tmpl_ms = (time.perf_counter() - t) * 1000 / len(crops)
+
+    ok = wrong = 0
+    for e, text in zip(labels, results):
+        if text is None:
+            continue
+        if text == f"{e['no']} {e['type']} {e['status']}":
+            ok += 1
+        else:
+            wrong += 1
+            print(f"  [X] {e['file']}: {text} (정답 {e['no']} {e['type']} {e['status']})")
+    n = len(labels)
+    print(f"템플릿: 행당 {tmpl_ms:.2f} ms, 인식 {ok + wrong}/{n} (대체 {n - ok - wrong}), "
+          f"정확 {ok}/{ok + wrong}")
+
+    if with_ocr:
+        import pytesseract
+        t = time.perf_counter()
+        ocr_ok = 0
+        for e, c in zip(labels, crops):
+            row = parse_row(pytesseract.image_to_string(c, lang="kor+eng", config="--psm 7")) or {}
+            ocr_ok += int(row.get("no") == e["no"] and row.get("status") == e["status"])
+        ocr_ms = (time.perf_counter() - t) * 1000 / len(crops)
+        print(f"Tesseract: 행당 {ocr_ms:.1f} ms, 정확 {ocr_ok}/{n}  → 템플릿 x{ocr_ms / tmpl_ms:.0f} 빠름")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="주문 행 템플릿 인식기 학습/평가")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("extract", help="기록된 캡처 → 행 crop + 라벨 초안")
+    p.add_argument("record_dir")
+    p.add_argument("out_dir")
+    p = sub.add_parser("train", help="라벨된 행 → 템플릿 모델")
+    p.add_argument("rows_dir")
+    p.add_argument("-o", "--model", default="status_model.npz")
+    p.add_argument("--holdout", type=float, default=HOLDOUT, help="학습에서 뺄 검증 행 비율 (0~1)")
+    p = sub.add_parser("bench", help="정확도 + 행당 지연")
+    p.add_argument("rows_dir")
+    p.add_argument("-m", "--model", default="status_model.npz")
+    p.add_argument("--no-ocr", action="store_true", help="Tesseract 비교 생략")
+    args = ap.parse_args()
+
+    if args.cmd == "extract":
+        cmd_extract(args.record_dir, args.out_dir)
+    elif args.cmd == "train":
+        cmd_train(args.rows_dir, args.model, args.holdout)
+    else:
+        cmd_bench(args.rows_dir, args.model, not args.no_ocr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+single_instance 두 프로세스 테스트: 락 경쟁 / 상태 조회 / 해제 후 대기 획득
+
+  python -m pytest test_single_instance.py
+  python -m unittest test_single_instance
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from single_instance import SingleInstance, query_status
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 락 보유 프로세스: 획득 + 상태 서버 → "ready" 출력 → stdin 한 줄 받으면 해제 후 종료
+HOLDER = """
+import sys
+from single_instance import SingleInstance, StatusServer
+instance = SingleInstance(sys.argv[1])
+assert instance.acquire()
+status = StatusServer()
+status.update(count=7, window="메인")
+instance.publish(port=status.start())
+print("ready", flush=True)
+sys.stdin.readline()
+status.close()
+instance.release()
+"""
+
+
+class TwoProcessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lock_path = os.path.join(self.tmp.name, "monitor.lock")
+        self.holder = subprocess.Popen(
+            [sys.executable, "-c", HOLDER, self.lock_path], cwd=SCRIPT_DIR,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8",
+        )
+        self.assertEqual(self.holder.stdout.readline().strip(), "ready")
+        self.instance = SingleInstance(self.lock_path)
+
+    def tearDown(self):
+        self.instance.release()
+        if self.holder.poll() is None:
+            self.holder.kill()
+        self.holder.wait()
+        self.holder.stdin.close()
+        self.holder.stdout.close()
+        self.tmp.cleanup()
+
+    def _release_holder(self):
+        self.holder.stdin.write("\n")
+        self.holder.stdin.flush()
+
+    def test_second_acquire_fails(self):
+        self.assertFalse(self.instance.acquire())
+
+    def test_query_status_returns_holder_fields(self):
+        status = query_status(self.lock_path)
+        self.assertEqual(status["pid"], self.holder.pid)
+        self.assertEqual(status["count"], 7)
+        self.assertEqual(status["window"], "메인")
+
+    def test_waiting_acquire_succeeds_after_release(self):
+        # acquire 가 재시도하는 동안 보유 프로세스가 해제
+        threading.Timer(1.0, self._release_holder).start()
+        t = time.monotonic()
+        self.assertTrue(self.instance.acquire(wait_sec=10))
+        self.assertGreaterEqual(time.monotonic() - t, 1.0)
+        self.assertEqual(self.holder.wait(timeout=5), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+OCR 설정 자동 조정: 기록된 캡처(replay.py)를 재생해 전처리 / 인식 조합 비교
+→ 목표 정확도를 만족하는 가장 빠른 조합을 config.json "ocr_*" 에 기록
+
+비교 항목: 확대 배율 × 리샘플 필터 × 이진화 기준(고정값 / otsu) × Tesseract PSM
+  - 배율 낮은 조합부터 측정 (픽셀 수 ∝ 배율²)
+  - 오답이 허용치를 넘거나 누적 시간이 지금까지 최선 조합을 넘으면 그 조합은 중단
+  - 선택된 조합에서 반전 재시도가 한 번도 필요 없었으면 "ocr_invert": false
+  - config "row_cache" 가 켜져 있으면 조합마다 빈 행 캐시로 모니터와 같은 행 경로를 측정
+    (주문 목록 영역은 layout_cache.json rois.list)
+
+사용법:
+  1. config.json 에 "record_dir" 지정 → 영업 중 모니터 실행
+     → index.jsonl 에 실제 건수 "label" 추가 (감지 실패 / 오답 줄 우선)
+     label 이 하나도 없으면 감지 건수(자기 라벨)로 비교만 하고 config.json 은 그대로
+  2. python tune_ocr.py C:\\posdelay_rec --target 0.98
+     --dry-run: 결과만 출력 (config.json 그대로)
+"""
+
+import argparse
+import itertools
+import logging
+import time
+
+from PIL import Image
+
+from layout_cache import list_roi as layout_list_roi
+from monitor_config import CONFIG_FILE, load_config, save_config
+from ocr_pipeline import check_tesseract, ocr_order_count
+from replay import load_frames
+from row_cache import RowOcrCache
+
+RESAMPLE_COST = {"nearest": 0, "bilinear": 1, "bicubic": 2, "lanczos": 3}
+
+
+def _parse_threshold(value):
+    return value if value == "otsu" else int(value)
+
+
+def _sample(frames, n):
+    """시간순 프레임에서 고르게 n개"""
+    if not n or len(frames) <= n:
+        return frames
+    step = len(frames) / n
+    return [frames[int(i * step)] for i in range(n)]
+
+
+def evaluate(images, params, max_errors, budget_ms=None, row_cache=None, list_roi=None):
+    """조합 1개 재생 → {"ok", "errors", "ms", "inverted", "aborted"}
+
+    오답 max_errors 초과 또는 누적 시간 budget_ms 초과 시 중단 (aborted)
+    row_cache: 이 조합 전용 빈 RowOcrCache (None 이면 전체 OCR 만)
+    """
+    errors = inverted = 0
+    total_ms = 0.0
+    for n, (img, label) in enumerate(images, 1):
+        t = time.perf_counter()
+        count, matched = ocr_order_count(img, row_cache, list_roi=list_roi, **params, invert=True)
+        total_ms += (time.perf_counter() - t) * 1000
+        if count != label:
+            errors += 1
+        elif matched and "(inv)" in matched:
+            inverted += 1
+        if errors > max_errors:
+            return {"ok": False, "errors": errors, "ms": total_ms / n, "inverted": inverted, "aborted": "오답"}
+        if budget_ms is not None and total_ms > budget_ms:
+            return {"ok": False, "errors": errors, "ms": total_ms / n, "inverted": inverted, "aborted": "느림"}
+    return {"ok": True, "errors": errors, "ms": total_ms / len(images), "inverted": inverted, "aborted": None}
+
+
+def _label(params):
+    return (f"x{params['scale']:<4g} {params['resample']:<8} "
+            f"thr {str(params['threshold']):<5} psm {params['psm']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="OCR 배율 / 이진화 / PSM 자동 조정")
+    ap.add_argument("record_dir")
+    ap.add_argument("--target", type=float, default=0.98, help="목표 정확도 (0~1)")
+    ap.add_argument("--scales", default="1,1.5,2")
+    ap.add_argument("--resample", default="bilinear,bicubic,lanczos")
+    ap.add_argument("--thresholds", default="otsu,128,160", help="고정값(0~255) 또는 otsu")
+    ap.add_argument("--psm", default="6,4")
+    ap.add_argument("--max-frames", type=int, default=40, help="재생할 프레임 수 상한 (고르게 추출)")
+    ap.add_argument("--dry-run", action="store_true", help="config.json 에 기록하지 않음")
+    args = ap.parse_args()
+    # 프레임마다 찍히는 행 분류 / OCR 텍스트 로그가 결과 표를 덮지 않도록 경고만
+    logging.getLogger("mate_monitor.ocr").setLevel(logging.WARNING)
+
+    frames = load_frames(args.record_dir)
+    labelled = [(path, n) for path, n, explicit in frames if explicit]
+    detected = [(path, n) for path, n, explicit in frames if not explicit and n is not None]
+    failed = len(frames) - len(labelled) - len(detected)
+    print(f"기록 {len(frames)}개: 정답 label {len(labelled)}, 자기 라벨(감지 건수) {len(detected)}, "
+          f"감지 실패(label 없음) {failed}")
+    if labelled:
+        frames = labelled
+    elif detected:
+        print("[!] label 있는 프레임 없음 → 감지 건수와 비교만 (config.json 기록 안 함)")
+        frames = detected
+        args.dry_run = True
+    else:
+        print(f"[!] 건수 있는 프레임 없음: {args.record_dir}")
+        return
+    frames = _sample(frames, args.max_frames)
+    cfg, _ = load_config()
+    check_tesseract(cfg)
+    images = [(Image.open(path).convert("RGB"), label) for path, label in frames]
+    max_errors = int(len(images) * (1 - args.target) + 1e-9)
+    list_roi = layout_list_roi()
+    use_rows = cfg["row_cache"] and bool(list_roi)
+
+    candidates = [
+        {"scale": float(s), "resample": r, "threshold": _parse_threshold(t), "psm": int(p)}
+        for s, r, t, p in itertools.product(args.scales.split(","), args.resample.split(","),
+                                            args.thresholds.split(","), args.psm.split(","))
+    ]
+    candidates.sort(key=lambda c: (c["scale"], RESAMPLE_COST[c["resample"]]))
+    print(f"프레임 {len(images)}개 × 조합 {len(candidates)}개 (목표 {args.target:.0%}, 허용 오답 {max_errors}, "
+          f"{'행 캐시' if use_rows else '전체 OCR'})")
+
+    best = None
+    for params in candidates:
+        budget = best[1]["ms"] * len(images) if best else None
+        # 조합마다 빈 캐시 → 앞 조합의 인식 결과를 재사용하지 않음 (전처리가 달라 키도 다름)
+        cache = None
+        if use_rows:
+            cache = RowOcrCache(cfg["row_cache_max_entries"], int(cfg["row_cache_max_mb"] * 1024 * 1024))
+        res = evaluate(images, params, max_errors, budget, cache, list_roi)
+        acc = 1 - res["errors"] / len(images)
+        note = f"중단({res['aborted']})" if res["aborted"] else f"정확도 {acc:.1%}"
+        print(f"  {_label(params)}  {res['ms']:7.1f} ms/프레임  {note}")
+        if res["ok"] and (best is None or res["ms"] < best[1]["ms"]):
+            best = (params, res)
+
+    if best is None:
+        print("[!] 목표 정확도를 만족하는 조합 없음 (--target 낮추거나 label 보정 확인)")
+        return
+    params, res = best
+    current = {k: cfg[f"ocr_{k}"] for k in params}
+    print(f"\n선택: {_label(params)}  {res['ms']:.1f} ms/프레임, "
+          f"정확도 {1 - res['errors'] / len(images):.1%}, 반전 필요 {res['inverted']}회")
+    print(f"기존: {_label(current)}")
+
+    if args.dry_run:
+        return
+    updates = {f"ocr_{k}": int(v) if k == "scale" and v == int(v) else v for k, v in params.items()}
+    updates["ocr_invert"] = res["inverted"] > 0
+    save_config(updates)
+    print(f"[OK] → {CONFIG_FILE}")
+
+
+if __name__ == "__main__":
+    main()